@@ -73,13 +73,9 @@ SWOT 分析要全面客观，既看到机会也识别威胁。
         try:
             # 创建流式消息ID
             message_id = str(uuid.uuid4())
-            full_content = ""
             
             # 流式回调包装
             async def stream_handler(chunk: str, metadata: dict = None):
-                nonlocal full_content
-                full_content += chunk
-                
                 if stream_callback:
                     await stream_callback(
                         message_id=message_id,
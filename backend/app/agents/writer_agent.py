@@ -13,6 +13,9 @@ from ..utils.streaming_llm import streaming_llm
 
 settings = get_settings()
 
+# 未做洞察提炼（basic 深度）时的投资评级
+NOT_RATED = "未评级"
+
 
 class WriterAgent:
     """
@@ -63,7 +66,8 @@ class WriterAgent:
             data: 结构化数据
             financial_analysis: 财务分析结果
             market_analysis: 市场分析结果
-            insights: 投资洞察
+            insights: 投资洞察，为空时不生成洞察、风险和投资建议章节，
+                评级标记为未评级，综合评分取财务与市场评分的均值
             depth: 研究深度 (basic, standard, deep)
             stream_callback: 流式回调函数 (message_id, agent_name, chunk, finished)
         
@@ -76,6 +80,16 @@ class WriterAgent:
         fin_analysis = financial_analysis.get("financial_analysis", {})
         mkt_analysis = market_analysis.get("market_analysis", {})
         insight_data = insights.get("insights", {})
+        fin_score = fin_analysis.get("overall_score", 5)
+        mkt_score = mkt_analysis.get("market_position", {}).get("score", 5)
+        
+        if insight_data:
+            overall_score = insight_data.get("overall_score", 5)
+            recommendation = insight_data.get("recommendation", {}).get("rating", "观望")
+        else:
+            # 没有洞察时不编造评级，综合评分由实际的财务与市场评分得出
+            overall_score = round((fin_score + mkt_score) / 2, 1)
+            recommendation = NOT_RATED
         
         # 生成执行摘要
         executive_summary = await self._generate_executive_summary(
@@ -90,8 +104,8 @@ class WriterAgent:
                 "stock_code": structured_data.get("stock_code", ""),
                 "industry": structured_data.get("industry", ""),
                 "research_date": datetime.now().isoformat(),
-                "overall_score": insight_data.get("overall_score", 5),
-                "recommendation": insight_data.get("recommendation", {}).get("rating", "观望")
+                "overall_score": overall_score,
+                "recommendation": recommendation
             },
             "sections": [
                 {
@@ -121,7 +135,7 @@ class WriterAgent:
                 {
                     "id": "financial_analysis",
                     "title": "财务分析",
-                    "overall_score": fin_analysis.get("overall_score", 5),
+                    "overall_score": fin_score,
                     "summary": fin_analysis.get("summary", ""),
                     "subsections": [
                         {
@@ -151,7 +165,7 @@ class WriterAgent:
                 {
                     "id": "market_analysis",
                     "title": "市场分析",
-                    "overall_score": mkt_analysis.get("market_position", {}).get("score", 5),
+                    "overall_score": mkt_score,
                     "subsections": self._build_market_subsections(mkt_analysis, depth),
                     "swot": mkt_analysis.get("swot", {
                         "strengths": [],
@@ -160,44 +174,14 @@ class WriterAgent:
                         "threats": []
                     }),
                     "porter_five_forces": mkt_analysis.get("porter_five_forces", {}),
-                    "summary": f"市场地位评分：{mkt_analysis.get('market_position', {}).get('score', 5)}/10，发展前景：{mkt_analysis.get('outlook', {}).get('rating', '中性')}"
-                },
-                {
-                    "id": "investment_insights",
-                    "title": "投资洞察",
-                    "content": self._format_insights_content(insight_data),
-                    "key_points": [i.get("content", "") for i in insight_data.get("core_insights", [])[:3]],
-                    "subsections": [
-                        {
-                            "title": "看多逻辑",
-                            "content": insight_data.get("investment_thesis", {}).get("bull_case", "")
-                        },
-                        {
-                            "title": "看空逻辑",
-                            "content": insight_data.get("investment_thesis", {}).get("bear_case", "")
-                        }
-                    ],
-                    "catalysts": [c.get("event", c) if isinstance(c, dict) else c for c in insight_data.get("catalysts", [])]
-                },
-                {
-                    "id": "risk_assessment",
-                    "title": "风险评估",
-                    "content": "以下是本公司面临的主要风险因素：",
-                    "risks": insight_data.get("key_risks", [])
-                },
-                {
-                    "id": "recommendation",
-                    "title": "投资建议",
-                    "recommendation": insight_data.get("recommendation", {}).get("rating", "观望"),
-                    "confidence": insight_data.get("recommendation", {}).get("confidence", "低"),
-                    "reasoning": insight_data.get("recommendation", {}).get("reasoning", ""),
-                    "content": insight_data.get("recommendation", {}).get("reasoning", ""),
-                    "catalysts": [c.get("event", c) if isinstance(c, dict) else c for c in insight_data.get("catalysts", [])],
-                    "target_audience": insight_data.get("recommendation", {}).get("target_audience", "")
+                    "summary": f"市场地位评分：{mkt_score}/10，发展前景：{mkt_analysis.get('outlook', {}).get('rating', '中性')}"
                 }
             ]
         }
         
+        if insight_data:
+            report["sections"].extend(self._build_insight_sections(insight_data))
+        
         print(f"[WriterAgent] 报告撰写完成，共 {len(report['sections'])} 个章节")
         
         return {
@@ -206,6 +190,44 @@ class WriterAgent:
             "status": "success"
         }
     
+    def _build_insight_sections(self, insight_data: Dict) -> List[Dict[str, Any]]:
+        """构建投资洞察、风险评估和投资建议章节"""
+        return [
+            {
+                "id": "investment_insights",
+                "title": "投资洞察",
+                "content": self._format_insights_content(insight_data),
+                "key_points": [i.get("content", "") for i in insight_data.get("core_insights", [])[:3]],
+                "subsections": [
+                    {
+                        "title": "看多逻辑",
+                        "content": insight_data.get("investment_thesis", {}).get("bull_case", "")
+                    },
+                    {
+                        "title": "看空逻辑",
+                        "content": insight_data.get("investment_thesis", {}).get("bear_case", "")
+                    }
+                ],
+                "catalysts": [c.get("event", c) if isinstance(c, dict) else c for c in insight_data.get("catalysts", [])]
+            },
+            {
+                "id": "risk_assessment",
+                "title": "风险评估",
+                "content": "以下是本公司面临的主要风险因素：",
+                "risks": insight_data.get("key_risks", [])
+            },
+            {
+                "id": "recommendation",
+                "title": "投资建议",
+                "recommendation": insight_data.get("recommendation", {}).get("rating", "观望"),
+                "confidence": insight_data.get("recommendation", {}).get("confidence", "低"),
+                "reasoning": insight_data.get("recommendation", {}).get("reasoning", ""),
+                "content": insight_data.get("recommendation", {}).get("reasoning", ""),
+                "catalysts": [c.get("event", c) if isinstance(c, dict) else c for c in insight_data.get("catalysts", [])],
+                "target_audience": insight_data.get("recommendation", {}).get("target_audience", "")
+            }
+        ]
+    
     async def _generate_executive_summary(
         self,
         company: str,
@@ -215,7 +237,19 @@ class WriterAgent:
         insights: Dict,
         stream_callback: Optional[Callable] = None
     ) -> str:
-        """生成执行摘要"""
+        """生成执行摘要（没有洞察时不提及投资评级）"""
+        outlook_line = f"- 发展前景: {mkt_analysis.get('outlook', {}).get('rating', '中性')}\n"
+        if insights:
+            insight_block = f"""- 投资评级: {insights.get('recommendation', {}).get('rating', '观望')}
+{outlook_line}
+## 核心洞察
+{json.dumps(insights.get('core_insights', []), ensure_ascii=False, indent=2)}
+"""
+            judgement_item = "5. 投资价值判断\n"
+        else:
+            insight_block = outlook_line
+            judgement_item = ""
+        
         prompt = f"""请为 {company} 撰写一份专业的研究报告执行摘要。
 
 ## 公司信息
@@ -225,31 +259,21 @@ class WriterAgent:
 ## 核心数据
 - 财务健康度: {fin_analysis.get('overall_score', 5)}/10
 - 市场地位: {mkt_analysis.get('market_position', {}).get('score', 5)}/10
-- 投资评级: {insights.get('recommendation', {}).get('rating', '观望')}
-- 发展前景: {mkt_analysis.get('outlook', {}).get('rating', '中性')}
-
-## 核心洞察
-{json.dumps(insights.get('core_insights', []), ensure_ascii=False, indent=2)}
-
+{insight_block}
 请撰写 200-300 字的执行摘要，包含:
 1. 公司简介和核心业务
 2. 财务状况要点
 3. 市场竞争地位
 4. 发展前景展望
-5. 投资价值判断
-
+{judgement_item}
 直接返回摘要文本，不要标题。"""
 
         try:
             # 创建流式消息ID
             message_id = str(uuid.uuid4())
-            full_content = ""
             
             # 流式回调包装
             async def stream_handler(chunk: str, metadata: dict = None):
-                nonlocal full_content
-                full_content += chunk
-                
                 if stream_callback:
                     await stream_callback(
                         message_id=message_id,
@@ -125,6 +125,7 @@ async def register(request: RegisterRequest):
                 if db_user:
                     db_user.is_admin = True
                     await db.commit()
+                    auth_service.invalidate_user(db_user)
         
         # 创建访问令牌
         access_token = create_access_token(
@@ -1,4 +1,5 @@
 """聊天 API"""
+from datetime import datetime
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, HTTPException
 from pydantic import BaseModel
 from typing import Optional, List
@@ -27,10 +28,24 @@ async def create_conversation():
 
 
 @router.get("/conversations")
-async def get_conversations(limit: int = 50):
-    """获取会话列表"""
-    conversations = await chat_service.get_conversation_list(limit=limit)
-    return {"conversations": conversations}
+async def get_conversations(limit: int = 50, cursor: Optional[str] = None):
+    """获取会话列表（cursor 为上一页返回的 next_cursor）"""
+    page_cursor = None
+    if cursor:
+        try:
+            updated_at, conversation_id = cursor.split("|", 1)
+            page_cursor = (datetime.fromisoformat(updated_at), conversation_id)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="无效的分页游标")
+    
+    conversations = await chat_service.get_conversation_list(limit=limit, cursor=page_cursor)
+    
+    next_cursor = None
+    if len(conversations) == limit and conversations[-1]["updated_at"]:
+        last = conversations[-1]
+        next_cursor = f"{last['updated_at']}|{last['id']}"
+    
+    return {"conversations": conversations, "next_cursor": next_cursor}
 
 
 @router.get("/conversations/{conversation_id}")
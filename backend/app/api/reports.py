@@ -66,7 +66,6 @@ async def get_report(
             )
             db.add(report)
             await db.commit()
-            await db.refresh(report)
     
     if not report:
         raise HTTPException(status_code=404, detail="报告不存在")
@@ -143,7 +142,6 @@ async def generate_report_from_task(
     )
     db.add(report)
     await db.commit()
-    await db.refresh(report)
     
     return {"report_id": report.id, "message": "报告创建成功"}
 
@@ -2,7 +2,7 @@
 import asyncio
 from datetime import datetime
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, WebSocket, WebSocketDisconnect
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
@@ -10,6 +10,7 @@ from sqlalchemy import select
 from ..database import get_db
 from ..models.research import ResearchTask
 from ..utils.ws_manager import ws_manager
+from ..utils.task_status_cache import task_status_cache, make_status_etag
 
 router = APIRouter()
 
@@ -53,8 +54,8 @@ async def start_research(
         progress=0
     )
     db.add(task)
+    # id 由 Python 端 default 生成，flush 后即可读取，无需 refresh 回读
     await db.commit()
-    await db.refresh(task)
     
     # 在后台启动研究任务
     asyncio.create_task(run_research_task(task.id))
@@ -76,26 +77,43 @@ async def run_research_task(task_id: str):
 @router.get("/research/{task_id}/status", response_model=TaskStatusResponse)
 async def get_research_status(
     task_id: str,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db)
 ):
     """获取研究进度"""
-    result = await db.execute(
-        select(ResearchTask).where(ResearchTask.id == task_id)
-    )
-    task = result.scalar_one_or_none()
+    # 优先读取研究任务推送的状态缓存
+    status = task_status_cache.get(task_id)
     
-    if not task:
-        raise HTTPException(status_code=404, detail="任务不存在")
+    if status is None:
+        result = await db.execute(
+            select(ResearchTask).where(ResearchTask.id == task_id)
+        )
+        task = result.scalar_one_or_none()
+        
+        if not task:
+            raise HTTPException(status_code=404, detail="任务不存在")
+        
+        status = {
+            "id": task.id,
+            "company": task.company,
+            "status": task.status,
+            "progress": task.progress,
+            "current_agent": task.current_agent or "",
+            "current_task": task.current_task or "",
+            "estimated_time": task.estimated_time or 0
+        }
+        # 已结束的任务不再变化，无需缓存
+        if task.status not in ("completed", "failed"):
+            task_status_cache.fill(task_id, status)
     
-    return TaskStatusResponse(
-        id=task.id,
-        company=task.company,
-        status=task.status,
-        progress=task.progress,
-        current_agent=task.current_agent or "",
-        current_task=task.current_task or "",
-        estimated_time=task.estimated_time or 0
-    )
+    # 状态未变化时返回 304，避免重复传输
+    etag = make_status_etag(status)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    
+    response.headers["ETag"] = etag
+    return TaskStatusResponse(**status)
 
 
 @router.get("/research/{task_id}/result")
@@ -11,15 +11,18 @@ class Settings(BaseSettings):
     openai_api_key: str = ""
     openai_base_url: str = "https://api.openai.com/v1"
     openai_model: str = "gpt-4"
+    agent_concurrency: int = 8  # 同时进行的 Agent（LLM）调用上限
     
     # Serper API
     serper_api_key: str = ""
+    serper_concurrency: int = 8  # 同时进行的 Serper 请求上限
     
     # Database
     database_url: str = "sqlite+aiosqlite:///./research.db"
     
     # App Config
     debug: bool = True
+    log_level: str = "INFO"  # 应用日志级别（宿主已配置 app logger 时不生效）
     frontend_url: str = "http://localhost:5173"
     backend_url: str = "http://localhost:8000"
     
@@ -29,6 +32,7 @@ class Settings(BaseSettings):
     
     # Auth
     secret_key: str = "your-secret-key-please-change-in-production-env"
+    bcrypt_cost: int = 12  # bcrypt 工作因子 (2^cost 轮)
     
     class Config:
         env_file = ".env"
@@ -1,4 +1,7 @@
 """数据库连接和会话管理"""
+import json
+from typing import Any
+import orjson
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import sessionmaker
 from .config import get_settings
@@ -6,11 +9,27 @@ from .models.research import Base
 
 settings = get_settings()
 
+
+def _json_serializer(value: Any) -> str:
+    """JSON 列序列化（orjson，非字符串键按字符串写入，与标准库行为一致）"""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+
+def _json_deserializer(value: str) -> Any:
+    """JSON 列反序列化（旧数据中可能含标准库写入的 NaN/Infinity，回退到标准库解析）"""
+    try:
+        return orjson.loads(value)
+    except orjson.JSONDecodeError:
+        return json.loads(value)
+
+
 # 创建异步引擎
 engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,
-    future=True
+    future=True,
+    json_serializer=_json_serializer,
+    json_deserializer=_json_deserializer
 )
 
 # 创建异步会话工厂
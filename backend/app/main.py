@@ -7,6 +7,8 @@ from fastapi.middleware.cors import CORSMiddleware
 from .config import get_settings
 from .database import init_db, engine
 from .api import research, reports, chat, auth
+from .tools.serper_search import close_client as close_search_client
+from .services.report_service import shutdown_pdf_pool
 
 settings = get_settings()
 
@@ -36,6 +38,12 @@ async def lifespan(app: FastAPI):
         _shutdown_flag = True
         print("\n[INFO] Shutting down...")
         
+        # 关闭搜索 HTTP 连接池
+        await close_search_client()
+        
+        # 关闭 PDF 渲染进程池（等待子进程退出，不阻塞事件循环）
+        await asyncio.to_thread(shutdown_pdf_pool)
+        
         # 关闭数据库连接
         await engine.dispose()
         print("[OK] Database connections closed")
@@ -1,7 +1,7 @@
 """会话和消息数据模型"""
 from datetime import datetime
 from typing import Optional, List
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey, JSON, Enum as SQLEnum
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, JSON, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 import enum
 import uuid
@@ -47,6 +47,11 @@ class Conversation(Base):
     # 消息列表
     messages = relationship("Message", back_populates="conversation", order_by="Message.created_at")
     
+    __table_args__ = (
+        # 会话列表按 (updated_at, id) 键集分页
+        Index("ix_conversations_updated_at_id", updated_at.desc(), id.desc()),
+    )
+    
     def to_dict(self):
         return {
             "id": self.id,
@@ -87,6 +92,11 @@ class Message(Base):
     # 关联
     conversation = relationship("Conversation", back_populates="messages")
     
+    __table_args__ = (
+        # 按会话加载消息列表（WHERE conversation_id IN (...) ORDER BY created_at）
+        Index("ix_messages_conversation_id_created_at", conversation_id, created_at),
+    )
+    
     def to_dict(self):
         return {
             "id": self.id,
@@ -1,34 +1,51 @@
 """认证服务"""
+import asyncio
+import time
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional
-from jose import JWTError, jwt
+import jwt
 import bcrypt
-from sqlalchemy import select
+from sqlalchemy import select, update, func, bindparam
 
 from ..config import get_settings
 from ..database import async_session_factory
 from ..models.user import User
+from ..utils.ttl_cache import TTLCache
 
 settings = get_settings()
 
+# 预构建的查询语句，避免每次调用重复构造
+_SEL_USER_BY_ID = select(User).where(User.id == bindparam("user_id"))
+_SEL_USER_BY_USERNAME = select(User).where(User.username == bindparam("username"))
+_SEL_USER_COUNT = select(func.count()).select_from(User)
+
 # JWT 配置
 SECRET_KEY = settings.secret_key or "your-secret-key-change-in-production"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 24 小时
 
+# 预先编码签名密钥，避免每次签发/校验重复编码
+_SIGNING_KEY = SECRET_KEY.encode('utf-8')
+
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """验证密码"""
-    return bcrypt.checkpw(
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """验证密码（在线程池中执行，避免阻塞事件循环）"""
+    return await asyncio.to_thread(
+        bcrypt.checkpw,
         plain_password.encode('utf-8'), 
         hashed_password.encode('utf-8')
     )
 
 
-def get_password_hash(password: str) -> str:
-    """获取密码哈希"""
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
+def _hash_password(password: bytes) -> bytes:
+    """生成盐并计算哈希（盐的随机数读取与哈希在同一线程内完成）"""
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds=settings.bcrypt_cost))
+
+
+async def get_password_hash(password: str) -> str:
+    """获取密码哈希（在线程池中执行，避免阻塞事件循环）"""
+    hashed = await asyncio.to_thread(_hash_password, password.encode('utf-8'))
     return hashed.decode('utf-8')
 
 
@@ -36,33 +53,57 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     """创建访问令牌"""
     to_encode = data.copy()
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = int(time.time() + expires_delta.total_seconds())
     else:
-        expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+        expire = int(time.time()) + ACCESS_TOKEN_EXPIRE_MINUTES * 60
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, _SIGNING_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
+@lru_cache(maxsize=4096)
+def _decode_token_cached(token: str) -> Optional[dict]:
+    """校验并解码令牌（按令牌字符串缓存，签名密钥变更时需 cache_clear）"""
+    try:
+        return jwt.decode(
+            token, _SIGNING_KEY, algorithms=[ALGORITHM], options={"require": ["exp"]}
+        )
+    except jwt.PyJWTError:
+        return None
+
+
 def decode_token(token: str) -> Optional[dict]:
     """解码令牌"""
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
-    except JWTError:
+    payload = _decode_token_cached(token)
+    # 缓存命中时令牌可能已过期，需要重新检查
+    if payload is None or payload["exp"] <= time.time():
         return None
+    return dict(payload)
 
 
 class AuthService:
     """认证服务"""
     
+    def __init__(self):
+        # 用户查询缓存（仅缓存存在的用户，更新时失效）
+        self._users_by_id = TTLCache(maxsize=1024, ttl=60)
+        self._users_by_username = TTLCache(maxsize=1024, ttl=60)
+    
+    def _cache_user(self, user: User):
+        """写入用户缓存"""
+        self._users_by_id.set(user.id, user)
+        self._users_by_username.set(user.username, user)
+    
+    def invalidate_user(self, user: User):
+        """用户信息变更后使缓存失效"""
+        self._users_by_id.pop(user.id)
+        self._users_by_username.pop(user.username)
+    
     async def create_user(self, username: str, password: str, email: str = None) -> User:
         """创建用户"""
         async with async_session_factory() as db:
             # 检查用户名是否已存在
-            result = await db.execute(
-                select(User).where(User.username == username)
-            )
+            result = await db.execute(_SEL_USER_BY_USERNAME, {"username": username})
             if result.scalar_one_or_none():
                 raise ValueError("用户名已存在")
             
@@ -70,53 +111,67 @@ class AuthService:
             user = User(
                 username=username,
                 email=email,
-                hashed_password=get_password_hash(password)
+                hashed_password=await get_password_hash(password)
             )
             db.add(user)
             await db.commit()
-            await db.refresh(user)
+            self.invalidate_user(user)
             return user
     
     async def authenticate_user(self, username: str, password: str) -> Optional[User]:
         """验证用户"""
+        # 复用用户缓存，密码校验期间不占用数据库连接
+        user = await self.get_user_by_username(username)
+        if not user:
+            return None
+        if not await verify_password(password, user.hashed_password):
+            return None
+        
+        # 更新最后登录时间（单条 UPDATE，无需重新加载用户）
+        last_login = datetime.utcnow()
         async with async_session_factory() as db:
-            result = await db.execute(
-                select(User).where(User.username == username)
+            await db.execute(
+                update(User).where(User.id == user.id).values(last_login=last_login)
             )
-            user = result.scalar_one_or_none()
-            
-            if not user:
-                return None
-            if not verify_password(password, user.hashed_password):
-                return None
-            
-            # 更新最后登录时间
-            user.last_login = datetime.utcnow()
             await db.commit()
-            
-            return user
+        
+        user.last_login = last_login
+        self.invalidate_user(user)
+        return user
     
     async def get_user_by_id(self, user_id: str) -> Optional[User]:
         """通过 ID 获取用户"""
+        user = self._users_by_id.get(user_id)
+        if user is not None:
+            return user
+        
         async with async_session_factory() as db:
-            result = await db.execute(
-                select(User).where(User.id == user_id)
-            )
-            return result.scalar_one_or_none()
+            result = await db.execute(_SEL_USER_BY_ID, {"user_id": user_id})
+            user = result.scalar_one_or_none()
+        
+        if user:
+            self._cache_user(user)
+        return user
     
     async def get_user_by_username(self, username: str) -> Optional[User]:
         """通过用户名获取用户"""
+        user = self._users_by_username.get(username)
+        if user is not None:
+            return user
+        
         async with async_session_factory() as db:
-            result = await db.execute(
-                select(User).where(User.username == username)
-            )
-            return result.scalar_one_or_none()
+            result = await db.execute(_SEL_USER_BY_USERNAME, {"username": username})
+            user = result.scalar_one_or_none()
+        
+        if user:
+            self._cache_user(user)
+        return user
     
     async def get_user_count(self) -> int:
         """获取用户数量"""
         async with async_session_factory() as db:
-            result = await db.execute(select(User))
-            return len(result.scalars().all())
+            result = await db.execute(_SEL_USER_COUNT)
+            return result.scalar_one()
 
 
 # 单例
@@ -1,10 +1,13 @@
 """聊天服务 - 管理会话和消息"""
 import asyncio
+import time
 import uuid
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional, List, Dict, Any
-from sqlalchemy import select, desc
-from sqlalchemy.orm import selectinload
+from typing import Optional, List, Dict, Any, Tuple
+from sqlalchemy import select, insert, update, desc, bindparam, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload, raiseload
 
 from ..database import async_session_factory
 from ..models.conversation import Conversation, Message
@@ -12,6 +15,41 @@ from ..models.research import ResearchTask, Report
 from ..agents.intent_agent import IntentAgent, IntentType, ParsedIntent
 from ..workflows.research_workflow import ResearchWorkflow
 from ..utils.ws_manager import ws_manager
+from ..utils.task_status_cache import task_status_cache
+from ..utils.log import get_logger
+
+logger = get_logger(__name__)
+
+
+# 预构建的查询语句，避免每次调用重复构造
+_SEL_CONVERSATION = select(Conversation).where(Conversation.id == bindparam("conversation_id"))
+_SEL_CONVERSATION_WITH_MESSAGES = (
+    select(Conversation)
+    .options(selectinload(Conversation.messages), raiseload("*"))
+    .where(Conversation.id == bindparam("conversation_id"))
+)
+_SEL_MESSAGE = select(Message).where(Message.id == bindparam("message_id"))
+_SEL_TASK = select(ResearchTask).where(ResearchTask.id == bindparam("task_id"))
+
+# 任务进度合并写入的时间窗口（秒）
+PROGRESS_FLUSH_INTERVAL = 0.1
+# 流式内容写入数据库的最小间隔（秒）
+STREAM_FLUSH_INTERVAL = 0.1
+# 消息写入队列容量（队列满时回调等待，形成背压）
+WRITE_QUEUE_SIZE = 1024
+# 后台写入任务单个事务最多合并的操作数
+WRITE_BATCH_SIZE = 64
+
+
+@dataclass
+class PendingWrite:
+    """待后台写入的消息操作"""
+    message_id: str
+    values: Dict[str, Any]
+    # 新增消息时为所属会话 ID，更新消息时为 None
+    conversation_id: Optional[str] = None
+    # 刷新标记：不写入数据库，之前入队的操作处理完成后设置结果
+    flushed: Optional[asyncio.Future] = None
 
 
 class ChatService:
@@ -20,6 +58,9 @@ class ChatService:
     def __init__(self):
         self.intent_agent = IntentAgent()
         self.workflow = ResearchWorkflow()
+        # 研究过程中的消息写入队列，由后台写入任务批量提交
+        self._write_q: asyncio.Queue = asyncio.Queue(maxsize=WRITE_QUEUE_SIZE)
+        self._writer_task: Optional[asyncio.Task] = None
     
     async def create_conversation(self) -> Conversation:
         """创建新会话"""
@@ -27,41 +68,56 @@ class ChatService:
             conversation = Conversation()
             db.add(conversation)
             await db.commit()
-            await db.refresh(conversation)
             return conversation
     
     async def get_conversation(self, conversation_id: str) -> Optional[Conversation]:
         """获取会话详情"""
         async with async_session_factory() as db:
             result = await db.execute(
-                select(Conversation)
-                .options(selectinload(Conversation.messages))
-                .where(Conversation.id == conversation_id)
+                _SEL_CONVERSATION_WITH_MESSAGES, {"conversation_id": conversation_id}
             )
             return result.scalar_one_or_none()
     
-    async def get_conversation_list(self, limit: int = 50) -> List[Dict]:
-        """获取会话列表"""
+    async def get_conversation_list(
+        self,
+        limit: int = 50,
+        cursor: Optional[Tuple[datetime, str]] = None
+    ) -> List[Dict]:
+        """
+        获取会话列表
+        
+        Args:
+            limit: 返回数量
+            cursor: 上一页最后一条的 (updated_at, id)，按键集分页继续读取
+        """
+        # 只查询需要的列，跳过 ORM 对象构建
+        stmt = select(
+            Conversation.id,
+            Conversation.title,
+            Conversation.company,
+            Conversation.status,
+            Conversation.task_id,
+            Conversation.created_at,
+            Conversation.updated_at,
+        )
+        if cursor:
+            stmt = stmt.where(tuple_(Conversation.updated_at, Conversation.id) < tuple_(*cursor))
+        stmt = stmt.order_by(desc(Conversation.updated_at), desc(Conversation.id)).limit(limit)
+        
         async with async_session_factory() as db:
-            result = await db.execute(
-                select(Conversation)
-                .order_by(desc(Conversation.updated_at))
-                .limit(limit)
-            )
-            conversations = result.scalars().all()
-            # 避免惰性加载问题，手动构建字典
+            result = await db.execute(stmt)
             return [
                 {
-                    "id": c.id,
-                    "title": c.title or "新对话",
-                    "company": c.company,
-                    "status": c.status,
-                    "task_id": c.task_id,
-                    "created_at": c.created_at.isoformat() if c.created_at else None,
-                    "updated_at": c.updated_at.isoformat() if c.updated_at else None,
+                    "id": row.id,
+                    "title": row.title or "新对话",
+                    "company": row.company,
+                    "status": row.status,
+                    "task_id": row.task_id,
+                    "created_at": row.created_at.isoformat() if row.created_at else None,
+                    "updated_at": row.updated_at.isoformat() if row.updated_at else None,
                     "message_count": 0  # 列表中不需要准确的消息数
                 }
-                for c in conversations
+                for row in result.all()
             ]
     
     async def add_message(
@@ -73,64 +129,224 @@ class ChatService:
         agent_name: str = None,
         agent_status: str = None,
         extra_data: Dict = None,
-        message_id: str = None
+        message_id: str = None,
+        db: Optional[AsyncSession] = None
     ) -> Message:
-        """添加消息"""
+        """
+        添加消息
+        
+        传入 db 时在调用方的会话中写入，由调用方负责提交
+        """
+        message = Message(
+            id=message_id or str(uuid.uuid4()),
+            conversation_id=conversation_id,
+            role=role,
+            content=content,
+            message_type=message_type,
+            agent_name=agent_name,
+            agent_status=agent_status,
+            extra_data=extra_data
+        )
+        if db is not None:
+            await self._stage_message(db, message)
+            return message
+        
         async with async_session_factory() as db:
-            message = Message(
-                id=message_id or str(uuid.uuid4()),
-                conversation_id=conversation_id,
-                role=role,
-                content=content,
-                message_type=message_type,
-                agent_name=agent_name,
-                agent_status=agent_status,
-                extra_data=extra_data
-            )
-            db.add(message)
-            
-            # 更新会话时间
-            result = await db.execute(
-                select(Conversation).where(Conversation.id == conversation_id)
-            )
-            conversation = result.scalar_one_or_none()
-            if conversation:
-                conversation.updated_at = datetime.utcnow()
-            
+            await self._stage_message(db, message)
+            # id/created_at 均由 Python 端 default 生成，提交后无需 refresh
             await db.commit()
-            await db.refresh(message)
             return message
     
+    async def _stage_message(self, db: AsyncSession, message: Message):
+        """将消息加入会话并更新会话时间（不提交）"""
+        db.add(message)
+        # 单条 UPDATE，无需先查询会话
+        await db.execute(
+            update(Conversation)
+            .where(Conversation.id == message.conversation_id)
+            .values(updated_at=datetime.utcnow())
+        )
+    
     async def update_message(
         self,
         message_id: str,
         content: str = None,
         agent_status: str = None,
         extra_data: Dict = None,
-        message_type: str = None
+        message_type: str = None,
+        db: Optional[AsyncSession] = None
     ) -> Optional[Message]:
-        """更新现有消息"""
+        """
+        更新现有消息
+        
+        传入 db 时在调用方的会话中更新，由调用方负责提交
+        """
+        if db is not None:
+            return await self._apply_message_update(
+                db, message_id, content, agent_status, extra_data, message_type
+            )
+        
         async with async_session_factory() as db:
-            result = await db.execute(
-                select(Message).where(Message.id == message_id)
+            message = await self._apply_message_update(
+                db, message_id, content, agent_status, extra_data, message_type
             )
-            message = result.scalar_one_or_none()
-            
-            if not message:
-                return None
+            if message:
+                # 消息已完整加载且没有服务端生成的字段，提交后无需 refresh
+                await db.commit()
+            return message
+    
+    async def _apply_message_update(
+        self,
+        db: AsyncSession,
+        message_id: str,
+        content: Optional[str],
+        agent_status: Optional[str],
+        extra_data: Optional[Dict],
+        message_type: Optional[str]
+    ) -> Optional[Message]:
+        """加载消息并修改字段（不提交）"""
+        result = await db.execute(_SEL_MESSAGE, {"message_id": message_id})
+        message = result.scalar_one_or_none()
+        
+        if not message:
+            return None
+        
+        if content is not None:
+            message.content = content
+        if agent_status is not None:
+            message.agent_status = agent_status
+        if extra_data is not None:
+            message.extra_data = extra_data
+        if message_type is not None:
+            message.message_type = message_type
+        return message
+    
+    async def _queue_add(
+        self,
+        conversation_id: str,
+        role: str,
+        content: str,
+        message_type: str = "text",
+        agent_name: str = None,
+        agent_status: str = None,
+        extra_data: Dict = None,
+        message_id: str = None
+    ) -> Message:
+        """添加消息（立即返回消息对象，数据库写入交给后台写入任务）"""
+        values = {
+            "id": message_id or str(uuid.uuid4()),
+            "conversation_id": conversation_id,
+            "role": role,
+            "content": content,
+            "message_type": message_type,
+            "agent_name": agent_name,
+            "agent_status": agent_status,
+            "extra_data": extra_data,
+            "created_at": datetime.utcnow()
+        }
+        await self._enqueue_write(
+            PendingWrite(message_id=values["id"], values=values, conversation_id=conversation_id)
+        )
+        return Message(**values)
+    
+    async def _queue_update(
+        self,
+        message: Message,
+        content: str = None,
+        agent_status: str = None,
+        extra_data: Dict = None,
+        message_type: str = None
+    ) -> Message:
+        """
+        更新消息（就地修改消息对象，数据库写入交给后台写入任务）
+        
+        只写入与内存副本不同的字段，没有变化时不入队
+        """
+        values = {
+            key: value
+            for key, value in (
+                ("content", content),
+                ("agent_status", agent_status),
+                ("extra_data", extra_data),
+                ("message_type", message_type),
+            )
+            if value is not None and getattr(message, key) != value
+        }
+        for key, value in values.items():
+            setattr(message, key, value)
+        if values:
+            await self._enqueue_write(PendingWrite(message_id=message.id, values=values))
+        return message
+    
+    async def _enqueue_write(self, op: PendingWrite):
+        """写入操作入队，按需启动后台写入任务"""
+        if self._writer_task is None or self._writer_task.done():
+            self._writer_task = asyncio.create_task(self._writer_loop())
+        await self._write_q.put(op)
+    
+    async def _flush_writes(self):
+        """
+        等待调用前已入队的写入操作处理完成
+        
+        向队列放入刷新标记，只等待标记之前的操作，不受之后其他会话持续写入的影响
+        """
+        flushed = asyncio.get_running_loop().create_future()
+        await self._enqueue_write(PendingWrite(message_id="", values={}, flushed=flushed))
+        await flushed
+    
+    async def _writer_loop(self):
+        """
+        后台写入任务
+        
+        取出一个操作后再取出已积压的操作（最多 WRITE_BATCH_SIZE 个），
+        按入队顺序在同一事务内执行并一次提交；事务失败时逐条重试。
+        """
+        while True:
+            batch = [await self._write_q.get()]
+            while len(batch) < WRITE_BATCH_SIZE and not self._write_q.empty():
+                batch.append(self._write_q.get_nowait())
             
-            if content is not None:
-                message.content = content
-            if agent_status is not None:
-                message.agent_status = agent_status
-            if extra_data is not None:
-                message.extra_data = extra_data
-            if message_type is not None:
-                message.message_type = message_type
+            ops = [op for op in batch if op.flushed is None]
+            try:
+                if ops:
+                    await self._commit_writes(ops)
+            except Exception as e:
+                # 批量事务失败时逐条重试，单条坏数据不连累其他会话的消息
+                logger.warning("消息批量写入失败（%d 条），逐条重试: %s", len(ops), e)
+                for op in ops:
+                    try:
+                        await self._commit_writes([op])
+                    except Exception as op_error:
+                        logger.exception("消息写入失败 %s: %s", op.message_id, op_error)
+            finally:
+                for op in batch:
+                    if op.flushed is not None and not op.flushed.done():
+                        op.flushed.set_result(None)
+                    self._write_q.task_done()
+    
+    async def _commit_writes(self, ops: List[PendingWrite]):
+        """在同一事务内按顺序执行写入操作并提交"""
+        async with async_session_factory() as db:
+            touched_conversations = set()
+            for op in ops:
+                if op.conversation_id is not None:
+                    await db.execute(insert(Message).values(**op.values))
+                    touched_conversations.add(op.conversation_id)
+                else:
+                    await db.execute(
+                        update(Message)
+                        .where(Message.id == op.message_id)
+                        .values(**op.values)
+                    )
             
+            # 新增消息的会话只更新一次时间
+            if touched_conversations:
+                await db.execute(
+                    update(Conversation)
+                    .where(Conversation.id.in_(touched_conversations))
+                    .values(updated_at=datetime.utcnow())
+                )
             await db.commit()
-            await db.refresh(message)
-            return message
     
     async def process_user_message(
         self,
@@ -147,41 +363,46 @@ class ChatService:
                 "task_id": str (如果启动了研究任务)
             }
         """
-        # 1. 保存用户消息
-        await self.add_message(
+        # 1. 保存用户消息（与意图解析互不依赖，并发执行）
+        save_task = asyncio.create_task(self.add_message(
             conversation_id=conversation_id,
             role="user",
             content=user_input
-        )
+        ))
         
         # 2. 解析意图
-        intent = await self.intent_agent.parse(user_input)
+        try:
+            intent = await self.intent_agent.parse(user_input)
+        finally:
+            # 后续消息必须排在用户消息之后
+            await save_task
         
         # 3. 根据意图处理
         if intent.intent_type == IntentType.RESEARCH_REPORT:
-            # 保存助手确认消息
-            await self.add_message(
-                conversation_id=conversation_id,
-                role="assistant",
-                content=intent.message
-            )
-            
-            # 更新会话信息
+            # 确认消息、会话信息与研究任务在同一会话中写入，一次提交
             async with async_session_factory() as db:
-                result = await db.execute(
-                    select(Conversation).where(Conversation.id == conversation_id)
+                # 保存助手确认消息
+                await self.add_message(
+                    conversation_id=conversation_id,
+                    role="assistant",
+                    content=intent.message,
+                    db=db
                 )
-                conversation = result.scalar_one_or_none()
-                if conversation:
-                    conversation.company = intent.company
-                    conversation.title = f"{intent.company} 研究报告"
-                    await db.commit()
-            
-            # 创建研究任务
-            task_id = await self._create_research_task(
-                conversation_id=conversation_id,
-                company=intent.company
-            )
+                
+                # 更新会话信息（单条 UPDATE，无需先查询会话）
+                await db.execute(
+                    update(Conversation)
+                    .where(Conversation.id == conversation_id)
+                    .values(company=intent.company, title=f"{intent.company} 研究报告")
+                )
+                
+                # 创建研究任务
+                task_id = await self._create_research_task(
+                    conversation_id=conversation_id,
+                    company=intent.company,
+                    db=db
+                )
+                await db.commit()
             
             # 后台启动研究
             asyncio.create_task(
@@ -207,30 +428,40 @@ class ChatService:
                 "task_id": None
             }
     
-    async def _create_research_task(self, conversation_id: str, company: str) -> str:
-        """创建研究任务"""
-        async with async_session_factory() as db:
-            task = ResearchTask(
-                company=company,
-                depth="deep",
-                focus_areas=[],
-                status="pending",
-                progress=0
-            )
-            db.add(task)
-            await db.commit()
-            await db.refresh(task)
-            
-            # 关联到会话
-            result = await db.execute(
-                select(Conversation).where(Conversation.id == conversation_id)
-            )
-            conversation = result.scalar_one_or_none()
-            if conversation:
-                conversation.task_id = task.id
+    async def _create_research_task(
+        self,
+        conversation_id: str,
+        company: str,
+        db: Optional[AsyncSession] = None
+    ) -> str:
+        """
+        创建研究任务
+        
+        传入 db 时在调用方的会话中写入，由调用方负责提交
+        """
+        if db is None:
+            async with async_session_factory() as db:
+                task_id = await self._create_research_task(conversation_id, company, db=db)
                 await db.commit()
-            
-            return task.id
+                return task_id
+        
+        task = ResearchTask(
+            id=str(uuid.uuid4()),
+            company=company,
+            depth="deep",
+            focus_areas=[],
+            status="pending",
+            progress=0
+        )
+        db.add(task)
+        
+        # 关联到会话（单条 UPDATE，与任务插入同一事务提交）
+        await db.execute(
+            update(Conversation)
+            .where(Conversation.id == conversation_id)
+            .values(task_id=task.id)
+        )
+        return task.id
     
     async def _run_research_with_chat(
         self,
@@ -242,9 +473,7 @@ class ChatService:
         try:
             async with async_session_factory() as db:
                 # 获取任务
-                result = await db.execute(
-                    select(ResearchTask).where(ResearchTask.id == task_id)
-                )
+                result = await db.execute(_SEL_TASK, {"task_id": task_id})
                 task = result.scalar_one_or_none()
                 if not task:
                     return
@@ -255,8 +484,14 @@ class ChatService:
             
             # 存储每个agent的消息ID，用于更新而不是创建新消息
             agent_message_ids: Dict[str, str] = {}
-            # 存储流式消息内容
-            streamingMessages: Dict[str, str] = {}
+            # 本次研究创建的消息（内存副本，写入由后台写入任务完成）
+            messages: Dict[str, Message] = {}
+            # 存储流式消息内容（按块累积，写入时再拼接）
+            streamingMessages: Dict[str, List[str]] = {}
+            # 每条流式消息最近一次写入数据库的时间
+            stream_flush_ts: Dict[str, float] = {}
+            # 待持久化的任务进度事件
+            progress_queue: asyncio.Queue = asyncio.Queue()
             
             # 进度回调 - 更新或创建 Agent 状态消息
             async def progress_callback(progress: int, agent: str, task_desc: str, estimated: int = 0):
@@ -266,21 +501,20 @@ class ChatService:
                 
                 message_id = agent_message_ids[agent]
                 
-                # 尝试更新现有消息，如果不存在则创建
-                message = await self.update_message(
-                    message_id=message_id,
-                    content=task_desc,
-                    agent_status="working",
-                    extra_data={
-                        "progress": progress,
-                        "estimated_time": estimated
-                    },
-                    message_type="agent_status"
-                )
-                
-                if not message:
-                    # 消息不存在，创建新消息
-                    message = await self.add_message(
+                # 更新现有消息，如果不存在则创建
+                if message_id in messages:
+                    message = await self._queue_update(
+                        messages[message_id],
+                        content=task_desc,
+                        agent_status="working",
+                        extra_data={
+                            "progress": progress,
+                            "estimated_time": estimated
+                        },
+                        message_type="agent_status"
+                    )
+                else:
+                    message = await self._queue_add(
                         conversation_id=conversation_id,
                         role="agent",
                         content=task_desc,
@@ -293,6 +527,7 @@ class ChatService:
                         },
                         message_id=message_id
                     )
+                    messages[message_id] = message
                 
                 # 广播到 WebSocket
                 await ws_manager.broadcast_to_conversation(conversation_id, {
@@ -300,41 +535,42 @@ class ChatService:
                     "message": message.to_dict()
                 })
                 
-                # 更新任务进度
-                async with async_session_factory() as db:
-                    result = await db.execute(
-                        select(ResearchTask).where(ResearchTask.id == task_id)
-                    )
-                    task = result.scalar_one_or_none()
-                    if task:
-                        task.progress = progress
-                        task.current_agent = agent
-                        task.current_task = task_desc
-                        await db.commit()
+                # 推送最新状态到缓存，供轮询接口读取
+                task_status_cache.set(task_id, {
+                    "id": task_id,
+                    "company": company,
+                    "status": "running",
+                    "progress": progress,
+                    "current_agent": agent,
+                    "current_task": task_desc,
+                    "estimated_time": estimated
+                })
+                
+                # 任务进度交给后台写入任务合并持久化
+                progress_queue.put_nowait((progress, agent, task_desc))
             
             # Agent 结果回调 - 更新现有消息为完成状态
             async def result_callback(agent: str, result_summary: str, result_data: Dict = None):
                 # 使用已有的message_id更新消息
-                if agent in agent_message_ids:
-                    message_id = agent_message_ids[agent]
+                message_id = agent_message_ids.get(agent)
+                if message_id in messages:
                     # 更新现有消息
-                    message = await self.update_message(
-                        message_id=message_id,
-                        content=result_summary if not streamingMessages.get(message_id) else streamingMessages[message_id],
+                    message = await self._queue_update(
+                        messages[message_id],
+                        content=result_summary if not streamingMessages.get(message_id) else "".join(streamingMessages[message_id]),
                         agent_status="completed",
                         message_type="agent_result",
                         extra_data=result_data
                     )
                     
-                    if message:
-                        await ws_manager.broadcast_to_conversation(conversation_id, {
-                            "type": "agent_result",
-                            "message": message.to_dict()
-                        })
-                        return
+                    await ws_manager.broadcast_to_conversation(conversation_id, {
+                        "type": "agent_result",
+                        "message": message.to_dict()
+                    })
+                    return
                 
                 # 如果没有找到现有消息，创建新消息（兜底）
-                message = await self.add_message(
+                message = await self._queue_add(
                     conversation_id=conversation_id,
                     role="agent",
                     content=result_summary,
@@ -360,16 +596,17 @@ class ChatService:
                 
                 # 如果是第一次流式输出，创建或更新消息为streaming状态
                 if chunk and not streamingMessages.get(message_id):
-                    streamingMessages[message_id] = ""
+                    streamingMessages[message_id] = []
                     # 确保消息存在
-                    message = await self.update_message(
-                        message_id=message_id,
-                        agent_status="streaming",
-                        message_type="streaming"
-                    )
-                    if not message:
+                    if message_id in messages:
+                        await self._queue_update(
+                            messages[message_id],
+                            agent_status="streaming",
+                            message_type="streaming"
+                        )
+                    else:
                         # 如果消息不存在，创建它
-                        await self.add_message(
+                        messages[message_id] = await self._queue_add(
                             conversation_id=conversation_id,
                             role="agent",
                             content="",
@@ -379,23 +616,28 @@ class ChatService:
                             message_id=message_id
                         )
                 
-                # 更新流式内容
+                # 本次需要写入的消息字段
+                message_updates: Dict[str, Any] = {}
                 if chunk:
-                    streamingMessages[message_id] = streamingMessages.get(message_id, "") + chunk
-                    # 更新消息内容
-                    await self.update_message(
-                        message_id=message_id,
-                        content=streamingMessages[message_id]
-                    )
+                    streamingMessages.setdefault(message_id, []).append(chunk)
+                    # 流式内容按时间窗口合并写入数据库
+                    now = time.monotonic()
+                    if now - stream_flush_ts.get(message_id, 0.0) >= STREAM_FLUSH_INTERVAL:
+                        stream_flush_ts[message_id] = now
+                        message_updates["content"] = "".join(streamingMessages[message_id])
                 
-                # 流式完成，更新状态
+                # 流式完成，写入完整内容并更新状态
                 if finished:
-                    await self.update_message(
-                        message_id=message_id,
-                        agent_status="completed",
-                        message_type="agent_result"
-                    )
+                    if message_id in streamingMessages:
+                        message_updates["content"] = "".join(streamingMessages[message_id])
+                    message_updates["agent_status"] = "completed"
+                    message_updates["message_type"] = "agent_result"
                 
+                # 消息写入只入队，不等待数据库
+                if message_updates and message_id in messages:
+                    await self._queue_update(messages[message_id], **message_updates)
+                
+                # 流式块已由 StreamingLLM 按字数/时间合并，每块直接推送一帧
                 await ws_manager.broadcast_stream_chunk(
                     conversation_id=conversation_id,
                     message_id=message_id,
@@ -405,58 +647,64 @@ class ChatService:
                 )
             
             # 运行 Workflow
-            report = await self.workflow.run(
-                company=company,
-                depth="deep",
-                focus_areas=[],
-                progress_callback=progress_callback,
-                result_callback=result_callback,
-                stream_callback=stream_callback
+            progress_writer = asyncio.create_task(
+                self._task_progress_writer(task_id, progress_queue)
             )
+            try:
+                report = await self.workflow.run(
+                    company=company,
+                    depth="deep",
+                    focus_areas=[],
+                    progress_callback=progress_callback,
+                    result_callback=result_callback,
+                    stream_callback=stream_callback
+                )
+            finally:
+                # 写入剩余进度并停止写入任务
+                progress_queue.put_nowait(None)
+                await progress_writer
+                # 等待消息写入完成，保证后续消息顺序
+                await self._flush_writes()
             
-            # 更新任务状态并创建报告
+            # 更新任务状态、创建报告、完成会话并保存预览消息（同一事务内提交）
             report_id = None
             async with async_session_factory() as db:
-                result = await db.execute(
-                    select(ResearchTask).where(ResearchTask.id == task_id)
-                )
+                result = await db.execute(_SEL_TASK, {"task_id": task_id})
                 task = result.scalar_one_or_none()
                 if task:
                     task.status = "completed"
                     task.progress = 100
                     task.completed_at = datetime.utcnow()
                     task.report_data = report
-                    await db.commit()
                     
                     # 创建报告记录
-                    new_report = Report(
+                    report_id = str(uuid.uuid4())
+                    db.add(Report(
+                        id=report_id,
                         task_id=task_id,
                         company=company,
                         content=report
-                    )
-                    db.add(new_report)
-                    await db.commit()
-                    await db.refresh(new_report)
-                    report_id = new_report.id
+                    ))
                 
                 # 更新会话状态
-                result = await db.execute(
-                    select(Conversation).where(Conversation.id == conversation_id)
-                )
+                result = await db.execute(_SEL_CONVERSATION, {"conversation_id": conversation_id})
                 conversation = result.scalar_one_or_none()
                 if conversation:
                     conversation.status = "completed"
-                    await db.commit()
-            
-            # 发送报告预览消息
-            report_preview = self._create_report_preview(report, report_id or task_id)
-            message = await self.add_message(
-                conversation_id=conversation_id,
-                role="assistant",
-                content=f"✅ {company} 的研究报告已生成完成！",
-                message_type="report_preview",
-                extra_data=report_preview
-            )
+                
+                # 发送报告预览消息
+                report_preview = self._create_report_preview(report, report_id or task_id)
+                message = await self.add_message(
+                    conversation_id=conversation_id,
+                    role="assistant",
+                    content=f"✅ {company} 的研究报告已生成完成！",
+                    message_type="report_preview",
+                    extra_data=report_preview,
+                    db=db
+                )
+                
+                await db.commit()
+            task_status_cache.evict(task_id)
             
             await ws_manager.broadcast_to_conversation(conversation_id, {
                 "type": "report_complete",
@@ -464,48 +712,78 @@ class ChatService:
             })
             
         except Exception as e:
-            print(f"研究任务失败: {e}")
-            import traceback
-            traceback.print_exc()
-            
-            # 保存错误消息
-            await self.add_message(
-                conversation_id=conversation_id,
-                role="assistant",
-                content=f"抱歉，研究过程中遇到了问题：{str(e)}",
-                message_type="error"
-            )
+            logger.exception("研究任务失败: %s", e)
             
-            # 更新状态
+            # 保存错误消息并更新状态（同一事务内提交）
             async with async_session_factory() as db:
-                result = await db.execute(
-                    select(ResearchTask).where(ResearchTask.id == task_id)
+                await self.add_message(
+                    conversation_id=conversation_id,
+                    role="assistant",
+                    content=f"抱歉，研究过程中遇到了问题：{str(e)}",
+                    message_type="error",
+                    db=db
                 )
+                
+                result = await db.execute(_SEL_TASK, {"task_id": task_id})
                 task = result.scalar_one_or_none()
                 if task:
                     task.status = "failed"
                     task.error_message = str(e)
-                    await db.commit()
                 
-                result = await db.execute(
-                    select(Conversation).where(Conversation.id == conversation_id)
-                )
+                result = await db.execute(_SEL_CONVERSATION, {"conversation_id": conversation_id})
                 conversation = result.scalar_one_or_none()
                 if conversation:
                     conversation.status = "failed"
-                    await db.commit()
+                
+                await db.commit()
+            task_status_cache.evict(task_id)
+    
+    async def _task_progress_writer(self, task_id: str, queue: asyncio.Queue):
+        """
+        合并写入任务进度
+        
+        每收到一个进度事件后等待一个短窗口，窗口内积压的事件只持久化最新一次；
+        收到 None 时写入剩余进度后退出。
+        """
+        finished = False
+        while not finished:
+            event = await queue.get()
+            if event is None:
+                return
+            
+            await asyncio.sleep(PROGRESS_FLUSH_INTERVAL)
+            while not queue.empty():
+                next_event = queue.get_nowait()
+                if next_event is None:
+                    finished = True
+                    break
+                event = next_event
+            
+            try:
+                await self._update_task_progress(task_id, *event)
+            except Exception as e:
+                logger.exception("任务进度写入失败: %s", e)
+    
+    async def _update_task_progress(self, task_id: str, progress: int, agent: str, task_desc: str):
+        """更新任务进度（单条 UPDATE）"""
+        async with async_session_factory() as db:
+            await db.execute(
+                update(ResearchTask)
+                .where(ResearchTask.id == task_id)
+                .values(progress=progress, current_agent=agent, current_task=task_desc)
+            )
+            await db.commit()
     
     def _create_report_preview(self, report: Dict, report_id: str) -> Dict:
         """创建报告预览数据"""
         metadata = report.get("metadata", {})
         sections = report.get("sections", [])
         
+        # 按章节 ID 建立索引
+        sections_by_id = {section.get("id"): section for section in sections}
+        
         # 获取执行摘要
-        executive_summary = ""
-        for section in sections:
-            if section.get("id") == "executive_summary":
-                executive_summary = section.get("content", "")[:200]
-                break
+        executive_summary = sections_by_id.get("executive_summary", {}).get("content", "")[:200]
         
         return {
             "report_id": report_id,
@@ -1,13 +1,17 @@
 """研究服务 - 使用 Workflow 协调 Agent 执行研究任务"""
 import asyncio
 from datetime import datetime
-from sqlalchemy import select
+from sqlalchemy import select, update
 
 from ..config import get_settings
 from ..database import async_session_factory
 from ..models.research import ResearchTask, Report
 from ..workflows.research_workflow import ResearchWorkflow
 from ..utils.ws_manager import ws_manager
+from ..utils.task_status_cache import task_status_cache
+from ..utils.log import get_logger
+
+logger = get_logger(__name__)
 
 settings = get_settings()
 
@@ -34,7 +38,7 @@ class ResearchService:
             try:
                 # 检查是否正在关闭
                 if is_shutting_down():
-                    print(f"[WARN] 应用正在关闭，跳过任务: {task_id}")
+                    logger.warning("应用正在关闭，跳过任务: %s", task_id)
                     return
                 
                 # 获取任务
@@ -44,7 +48,7 @@ class ResearchService:
                 task = result.scalar_one_or_none()
                 
                 if not task:
-                    print(f"任务不存在: {task_id}")
+                    logger.warning("任务不存在: %s", task_id)
                     return
                 
                 # 更新状态为运行中
@@ -52,19 +56,48 @@ class ResearchService:
                 task.started_at = datetime.utcnow()
                 await db.commit()
                 
+                # 进度写入按调用顺序执行（并行节点可能同时回调）
+                progress_lock = asyncio.Lock()
+                
                 # 进度回调 - 更新数据库和 WebSocket
                 async def progress_callback(progress: int, agent: str, task_desc: str, estimated: int = 0):
                     # 检查是否正在关闭
                     if is_shutting_down():
                         raise asyncio.CancelledError("Application is shutting down")
                     
+                    # 只更新内存中的任务对象（结束时随最终状态一起提交），数据库由下方 UPDATE 写入
                     task.progress = progress
                     task.current_agent = agent
                     task.current_task = task_desc
                     task.estimated_time = estimated
-                    await db.commit()
                     
-                    # 广播进度
+                    # 推送最新状态到缓存，供轮询接口读取
+                    task_status_cache.set(task_id, {
+                        "id": task_id,
+                        "company": task.company,
+                        "status": "running",
+                        "progress": progress,
+                        "current_agent": agent,
+                        "current_task": task_desc,
+                        "estimated_time": estimated
+                    })
+                    
+                    # 单条 UPDATE 写入进度，使用独立的短会话：
+                    # 并行节点会同时回调，不能并发操作整个任务共用的 db 会话
+                    async with progress_lock:
+                        async with async_session_factory() as progress_db:
+                            await progress_db.execute(
+                                update(ResearchTask)
+                                .where(ResearchTask.id == task_id)
+                                .values(
+                                    progress=progress,
+                                    current_agent=agent,
+                                    current_task=task_desc,
+                                    estimated_time=estimated
+                                )
+                            )
+                            await progress_db.commit()
+                    
                     await ws_manager.broadcast_progress(task_id, {
                         "progress": progress,
                         "status": "running",
@@ -89,6 +122,7 @@ class ResearchService:
                 task.current_agent = ""
                 task.current_task = "研究完成"
                 await db.commit()
+                task_status_cache.evict(task_id)
                 
                 # 创建报告记录
                 report = Report(
@@ -109,13 +143,14 @@ class ResearchService:
                 })
                 
             except asyncio.CancelledError:
-                print(f"[INFO] 研究任务被取消: {task_id}")
+                logger.info("研究任务被取消: %s", task_id)
                 
                 # 更新任务状态为取消
                 task.status = "failed"
                 task.error_message = "任务被取消（应用关闭）"
                 task.completed_at = datetime.utcnow()
                 await db.commit()
+                task_status_cache.evict(task_id)
                 
                 # 广播取消
                 await ws_manager.broadcast_progress(task_id, {
@@ -127,15 +162,14 @@ class ResearchService:
                 })
                 
             except Exception as e:
-                print(f"研究任务失败: {e}")
-                import traceback
-                traceback.print_exc()
+                logger.exception("研究任务失败: %s", e)
                 
                 # 更新任务状态为失败
                 task.status = "failed"
                 task.error_message = str(e)
                 task.completed_at = datetime.utcnow()
                 await db.commit()
+                task_status_cache.evict(task_id)
                 
                 # 广播失败
                 await ws_manager.broadcast_progress(task_id, {
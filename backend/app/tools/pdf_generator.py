@@ -1,69 +1,370 @@
 """PDF 报告生成器"""
 import os
-import io
-import tempfile
-from typing import Dict, Any, List
+import re
+import math
+from functools import lru_cache
+from typing import Dict, Any, List, Optional
 from datetime import datetime
-import numpy as np
-import matplotlib
-matplotlib.use('Agg')  # 使用非交互式后端
-import matplotlib.pyplot as plt
-from matplotlib.patches import Patch
-
-# 全局中文字体配置
-import matplotlib.font_manager as fm
-
-# 中文字体路径和属性
-_CHINESE_FONT_PATH = None
-_CHINESE_FONT_PROP = None
-
-def _get_chinese_font():
-    """获取中文字体 FontProperties"""
-    global _CHINESE_FONT_PATH, _CHINESE_FONT_PROP
-    
-    if _CHINESE_FONT_PROP is not None:
-        return _CHINESE_FONT_PROP
-    
-    # 尝试的字体路径
-    font_paths = [
-        '/usr/share/fonts/truetype/wqy/wqy-microhei.ttc',
-        '/usr/share/fonts/truetype/wqy/wqy-zenhei.ttc',
-        'C:/Windows/Fonts/simhei.ttf',
-        'C:/Windows/Fonts/msyh.ttc',
-    ]
-    
-    for path in font_paths:
-        if os.path.exists(path):
-            try:
-                _CHINESE_FONT_PROP = fm.FontProperties(fname=path)
-                _CHINESE_FONT_PATH = path
-                print(f"matplotlib 使用字体文件: {path}")
-                return _CHINESE_FONT_PROP
-            except Exception as e:
-                print(f"加载字体失败 {path}: {e}")
-    
-    print("警告: 未找到中文字体")
-    return None
-
-# 初始化字体
-_get_chinese_font()
-
+from xml.sax.saxutils import escape
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import cm, mm
 from reportlab.lib.colors import HexColor, black, white
 from reportlab.platypus import (
     SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle,
-    PageBreak, KeepTogether, Image
+    PageBreak, KeepTogether
 )
+from reportlab.graphics.shapes import Drawing, Wedge, Polygon, Circle, Line, Rect, String
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 
 from ..config import get_settings
+from ..utils.log import get_logger
+
+logger = get_logger(__name__)
 
 settings = get_settings()
 
 
+# reportlab 中文字体路径 (Windows + Linux/Docker)
+# 优先使用 TTF 格式的 WenQuanYi 字体
+_PDF_FONT_BACKUP_PATHS = [
+    # Linux/Docker - WenQuanYi 字体 (TTF 格式，reportlab 兼容)
+    "/usr/share/fonts/truetype/wqy/wqy-microhei.ttc",
+    "/usr/share/fonts/truetype/wqy/wqy-zenhei.ttc",
+    "/usr/share/fonts/wqy-microhei/wqy-microhei.ttc",
+    "/usr/share/fonts/wqy-zenhei/wqy-zenhei.ttc",
+    # Windows
+    "C:/Windows/Fonts/simhei.ttf",
+    "C:/Windows/Fonts/simsun.ttc",
+    "C:/Windows/Fonts/msyh.ttc",
+    "C:/Windows/Fonts/msyhl.ttc",
+]
+
+# 雷达图尺寸（与评分概览页中的占位一致）
+_RADAR_SIZE = 220
+_RADAR_RADIUS = 62
+# 仪表盘尺寸
+_GAUGE_WIDTH = 180
+_GAUGE_HEIGHT = 135
+
+_CHART_COLOR = HexColor('#6366f1')
+_GRID_COLOR = HexColor('#e5e7eb')
+_AXIS_COLOR = HexColor('#d1d5db')
+_TEXT_GRAY = HexColor('#6b7280')
+
+_REC_COLORS = {
+    '买入': '#10b981', '持有': '#f59e0b',
+    '卖出': '#ef4444', '观望': '#6b7280'
+}
+
+
+def _score_hex(score: float) -> str:
+    """根据评分返回颜色"""
+    if score >= 8:
+        return '#10b981'
+    elif score >= 6:
+        return '#f59e0b'
+    return '#ef4444'
+
+
+@lru_cache(maxsize=256)
+def _draw_radar(dimensions: tuple, font_name: str) -> Drawing:
+    """
+    绘制雷达图（矢量图形，直接写入 PDF）
+    
+    Drawing 只在渲染时被读取，相同输入的图表可在多份报告间复用。
+    """
+    d = Drawing(_RADAR_SIZE, _RADAR_SIZE)
+    cx = _RADAR_SIZE / 2
+    cy = _RADAR_SIZE / 2 - 15
+    radius = _RADAR_RADIUS
+    num_vars = len(dimensions)
+    
+    # 标题
+    title = '多维度评分分析' if font_name != 'Helvetica' else 'Score Analysis'
+    d.add(String(cx, _RADAR_SIZE - 14, title, fontName=font_name, fontSize=12,
+                 fillColor=HexColor('#1a1a2e'), textAnchor='middle'))
+    
+    # 网格
+    for level in (2, 4, 6, 8, 10):
+        d.add(Circle(cx, cy, radius * level / 10, fillColor=None,
+                     strokeColor=_AXIS_COLOR if level == 10 else _GRID_COLOR, strokeWidth=0.5))
+        d.add(String(cx + 2, cy + radius * level / 10 + 1, str(level),
+                     fontName='Helvetica', fontSize=6, fillColor=_TEXT_GRAY))
+    
+    # 从正上方开始顺时针排布各维度
+    directions = [
+        (math.cos(math.pi / 2 - 2 * math.pi * i / num_vars),
+         math.sin(math.pi / 2 - 2 * math.pi * i / num_vars))
+        for i in range(num_vars)
+    ]
+    
+    points = []
+    for (label, value), (dx, dy) in zip(dimensions, directions):
+        d.add(Line(cx, cy, cx + radius * dx, cy + radius * dy,
+                   strokeColor=_GRID_COLOR, strokeWidth=0.5))
+        
+        r = radius * min(max(value, 0), 10) / 10
+        points.extend((cx + r * dx, cy + r * dy))
+        
+        # 维度标签放在外圈之外，按方向决定对齐方式
+        if dx > 0.1:
+            anchor = 'start'
+        elif dx < -0.1:
+            anchor = 'end'
+        else:
+            anchor = 'middle'
+        lx = cx + (radius + 6) * dx
+        ly = cy + (radius + 6) * dy - (9 if dy < -0.9 else 3)
+        d.add(String(lx, ly, label, fontName=font_name, fontSize=9,
+                     fillColor=HexColor('#333333'), textAnchor=anchor))
+    
+    # 数据多边形与顶点
+    d.add(Polygon(points, fillColor=_CHART_COLOR, fillOpacity=0.25,
+                  strokeColor=_CHART_COLOR, strokeWidth=1.5))
+    for x, y in zip(points[::2], points[1::2]):
+        d.add(Circle(x, y, 2.5, fillColor=_CHART_COLOR, strokeColor=None))
+    
+    return d
+
+
+@lru_cache(maxsize=256)
+def _draw_gauge(score: float, recommendation: str, font_name: str) -> Drawing:
+    """绘制仪表盘图（矢量图形，相同输入在多份报告间复用）"""
+    d = Drawing(_GAUGE_WIDTH, _GAUGE_HEIGHT)
+    cx = _GAUGE_WIDTH / 2
+    cy = 55
+    color = HexColor(_score_hex(score))
+    
+    # 背景半圆环
+    d.add(Wedge(cx, cy, 70, 0, 180, radius1=49,
+                fillColor=HexColor('#808080'), fillOpacity=0.1, strokeColor=None))
+    
+    # 进度环（从左侧开始顺时针）
+    ratio = min(max(score / 10, 0), 1)
+    if ratio > 0:
+        d.add(Wedge(cx, cy, 70, 180 - 180 * ratio, 180, radius1=49,
+                    fillColor=color, fillOpacity=0.8, strokeColor=None))
+    
+    # 分数
+    d.add(String(cx, cy + 4, f'{score}', fontName='Helvetica-Bold', fontSize=28,
+                 fillColor=color, textAnchor='middle'))
+    
+    # "综合评分"
+    label = '综合评分' if font_name != 'Helvetica' else 'Score'
+    d.add(String(cx, cy - 14, label, fontName=font_name, fontSize=10,
+                 fillColor=_TEXT_GRAY, textAnchor='middle'))
+    
+    # 建议标签
+    rec_color = HexColor(_REC_COLORS.get(recommendation, '#6b7280'))
+    text_width = pdfmetrics.stringWidth(recommendation, font_name, 12)
+    d.add(Rect(cx - text_width / 2 - 8, cy - 48, text_width + 16, 20, rx=4, ry=4,
+               fillColor=rec_color, fillOpacity=0.15, strokeColor=None))
+    d.add(String(cx, cy - 42, recommendation, fontName=font_name, fontSize=12,
+                 fillColor=rec_color, textAnchor='middle'))
+    
+    return d
+
+
+def _first_value(lookups: tuple, default: Any = None) -> Any:
+    """按顺序查找 (字典, 键)，返回第一个非空值，找到即停止"""
+    for source, key in lookups:
+        value = source.get(key)
+        if value:
+            return value
+    return default
+
+
+# ISO 8601 日期前缀（YYYY-MM-DD），时间与时区部分不影响显示的日期
+_ISO_DATE_RE = re.compile(r'(\d{4})-(\d{2})-(\d{2})')
+
+
+@lru_cache(maxsize=128)
+def _format_iso_date(value: str) -> str:
+    """将 ISO 日期字符串格式化为中文日期（无法识别时取前 10 个字符）"""
+    match = _ISO_DATE_RE.match(value)
+    if match is None:
+        return value[:10]
+    year, month, day = match.groups()
+    return f"{year}年{month}月{day}日"
+
+
+@lru_cache(maxsize=None)
+def _register_pdf_font() -> str:
+    """
+    注册 reportlab 中文字体并返回字体名
+    
+    TTF 解析和注册是进程级的，结果缓存后同一进程内的 PDFGenerator 直接复用。
+    """
+    try:
+        font_path = settings.pdf_font_path
+        font_name = settings.pdf_font_name
+        
+        if os.path.exists(font_path):
+            # 注册时 reportlab 会把粗体/斜体映射到同一字体，无需再解析一次字体文件注册 -Bold
+            pdfmetrics.registerFont(TTFont(font_name, font_path))
+            print(f"使用配置字体: {font_path}")
+            return font_name
+        
+        for path in _PDF_FONT_BACKUP_PATHS:
+            if os.path.exists(path):
+                try:
+                    # 对于 TTC 文件，尝试指定子字体索引
+                    if path.endswith('.ttc'):
+                        pdfmetrics.registerFont(TTFont('ChineseFont', path, subfontIndex=0))
+                    else:
+                        pdfmetrics.registerFont(TTFont('ChineseFont', path))
+                    print(f"reportlab 使用字体: {path}")
+                    return 'ChineseFont'
+                except Exception as font_err:
+                    print(f"字体加载失败 {path}: {font_err}")
+                    continue
+        
+        print("警告: 未找到中文字体，PDF 中文将无法正常显示")
+        return 'Helvetica'
+    except Exception as e:
+        print(f"字体注册失败: {e}")
+        return 'Helvetica'
+
+
+@lru_cache(maxsize=4)
+def _build_styles(font_name: str) -> Dict[str, ParagraphStyle]:
+    """创建文档样式（样式创建后不再修改，按字体缓存）"""
+    base_styles = getSampleStyleSheet()
+    
+    styles = {
+        'title': ParagraphStyle(
+            'Title',
+            parent=base_styles['Title'],
+            fontName=font_name,
+            fontSize=24,
+            leading=30,
+            alignment=1,  # 居中
+            spaceAfter=20,
+            textColor=HexColor('#1a1a2e')
+        ),
+        'subtitle': ParagraphStyle(
+            'Subtitle',
+            parent=base_styles['Normal'],
+            fontName=font_name,
+            fontSize=12,
+            leading=16,
+            alignment=1,
+            spaceAfter=30,
+            textColor=HexColor('#666666')
+        ),
+        'heading1': ParagraphStyle(
+            'Heading1',
+            parent=base_styles['Heading1'],
+            fontName=font_name,
+            fontSize=18,
+            leading=24,
+            spaceBefore=20,
+            spaceAfter=12,
+            textColor=HexColor('#16213e')
+        ),
+        'heading2': ParagraphStyle(
+            'Heading2',
+            parent=base_styles['Heading2'],
+            fontName=font_name,
+            fontSize=14,
+            leading=18,
+            spaceBefore=15,
+            spaceAfter=8,
+            textColor=HexColor('#0f3460')
+        ),
+        'body': ParagraphStyle(
+            'Body',
+            parent=base_styles['Normal'],
+            fontName=font_name,
+            fontSize=11,
+            leading=16,
+            spaceAfter=10,
+            textColor=HexColor('#333333')
+        ),
+        'highlight': ParagraphStyle(
+            'Highlight',
+            parent=base_styles['Normal'],
+            fontName=font_name,
+            fontSize=11,
+            leading=16,
+            backColor=HexColor('#f0f4f8'),
+            borderPadding=10,
+            spaceAfter=10
+        ),
+        'footer': ParagraphStyle(
+            'Footer',
+            parent=base_styles['Normal'],
+            fontName=font_name,
+            fontSize=9,
+            textColor=HexColor('#999999'),
+            alignment=1
+        )
+    }
+    
+    return styles
+
+
+@lru_cache(maxsize=4)
+def _build_table_styles(font_name: str) -> Dict[str, TableStyle]:
+    """创建表格样式（TableStyle 可被多个表格复用，按字体缓存）"""
+    return {
+        'chart': TableStyle([
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ]),
+        'dimension': TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), HexColor('#16213e')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), white),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, -1), font_name),
+            ('FONTSIZE', (0, 0), (-1, -1), 11),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
+            ('TOPPADDING', (0, 0), (-1, -1), 10),
+            ('GRID', (0, 0), (-1, -1), 1, HexColor('#dddddd')),
+        ]),
+        'swot': TableStyle([
+            # 标题行样式
+            ('BACKGROUND', (0, 0), (0, 0), HexColor('#10b981')),
+            ('BACKGROUND', (1, 0), (1, 0), HexColor('#f59e0b')),
+            ('BACKGROUND', (0, 2), (0, 2), HexColor('#3b82f6')),
+            ('BACKGROUND', (1, 2), (1, 2), HexColor('#ef4444')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), white),
+            ('TEXTCOLOR', (0, 2), (-1, 2), white),
+            # 内容行样式
+            ('BACKGROUND', (0, 1), (0, 1), HexColor('#ecfdf5')),
+            ('BACKGROUND', (1, 1), (1, 1), HexColor('#fffbeb')),
+            ('BACKGROUND', (0, 3), (0, 3), HexColor('#eff6ff')),
+            ('BACKGROUND', (1, 3), (1, 3), HexColor('#fef2f2')),
+            # 通用样式
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('FONTNAME', (0, 0), (-1, -1), font_name),
+            ('FONTSIZE', (0, 0), (-1, 0), 11),
+            ('FONTSIZE', (0, 2), (-1, 2), 11),
+            ('FONTSIZE', (0, 1), (-1, 1), 10),
+            ('FONTSIZE', (0, 3), (-1, 3), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
+            ('TOPPADDING', (0, 0), (-1, -1), 10),
+            ('LEFTPADDING', (0, 0), (-1, -1), 10),
+            ('GRID', (0, 0), (-1, -1), 1, HexColor('#dddddd')),
+        ]),
+        'risk': TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), HexColor('#dc2626')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), white),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('ALIGN', (2, 0), (2, -1), 'CENTER'),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('FONTNAME', (0, 0), (-1, -1), font_name),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+            ('TOPPADDING', (0, 0), (-1, -1), 8),
+            ('GRID', (0, 0), (-1, -1), 1, HexColor('#dddddd')),
+        ]),
+    }
+
+
 class PDFGenerator:
     """PDF 报告生成器"""
     
@@ -73,133 +374,15 @@ class PDFGenerator:
         
         # 创建样式
         self.styles = self._create_styles()
+        self.table_styles = _build_table_styles(self.font_name)
     
     def _register_fonts(self):
-        """注册中文字体"""
-        try:
-            font_path = settings.pdf_font_path
-            font_name = settings.pdf_font_name
-            
-            if os.path.exists(font_path):
-                pdfmetrics.registerFont(TTFont(font_name, font_path))
-                pdfmetrics.registerFont(TTFont(f'{font_name}-Bold', font_path))
-                self.font_name = font_name
-                print(f"使用配置字体: {font_path}")
-            else:
-                # 尝试备用字体路径 (Windows + Linux/Docker)
-                # 优先使用 TTF 格式的 WenQuanYi 字体
-                backup_paths = [
-                    # Linux/Docker - WenQuanYi 字体 (TTF 格式，reportlab 兼容)
-                    "/usr/share/fonts/truetype/wqy/wqy-microhei.ttc",
-                    "/usr/share/fonts/truetype/wqy/wqy-zenhei.ttc",
-                    "/usr/share/fonts/wqy-microhei/wqy-microhei.ttc",
-                    "/usr/share/fonts/wqy-zenhei/wqy-zenhei.ttc",
-                    # Windows
-                    "C:/Windows/Fonts/simhei.ttf",
-                    "C:/Windows/Fonts/simsun.ttc",
-                    "C:/Windows/Fonts/msyh.ttc",
-                    "C:/Windows/Fonts/msyhl.ttc",
-                ]
-                
-                font_registered = False
-                for path in backup_paths:
-                    if os.path.exists(path):
-                        try:
-                            # 对于 TTC 文件，尝试指定子字体索引
-                            if path.endswith('.ttc'):
-                                pdfmetrics.registerFont(TTFont('ChineseFont', path, subfontIndex=0))
-                            else:
-                                pdfmetrics.registerFont(TTFont('ChineseFont', path))
-                            self.font_name = 'ChineseFont'
-                            print(f"reportlab 使用字体: {path}")
-                            font_registered = True
-                            break
-                        except Exception as font_err:
-                            print(f"字体加载失败 {path}: {font_err}")
-                            continue
-                
-                if not font_registered:
-                    print("警告: 未找到中文字体，PDF 中文将无法正常显示")
-                    self.font_name = 'Helvetica'
-        except Exception as e:
-            print(f"字体注册失败: {e}")
-            self.font_name = 'Helvetica'
+        """注册中文字体（每个进程只探测和解析一次）"""
+        self.font_name = _register_pdf_font()
     
     def _create_styles(self) -> Dict[str, ParagraphStyle]:
-        """创建文档样式"""
-        base_styles = getSampleStyleSheet()
-        
-        styles = {
-            'title': ParagraphStyle(
-                'Title',
-                parent=base_styles['Title'],
-                fontName=self.font_name,
-                fontSize=24,
-                leading=30,
-                alignment=1,  # 居中
-                spaceAfter=20,
-                textColor=HexColor('#1a1a2e')
-            ),
-            'subtitle': ParagraphStyle(
-                'Subtitle',
-                parent=base_styles['Normal'],
-                fontName=self.font_name,
-                fontSize=12,
-                leading=16,
-                alignment=1,
-                spaceAfter=30,
-                textColor=HexColor('#666666')
-            ),
-            'heading1': ParagraphStyle(
-                'Heading1',
-                parent=base_styles['Heading1'],
-                fontName=self.font_name,
-                fontSize=18,
-                leading=24,
-                spaceBefore=20,
-                spaceAfter=12,
-                textColor=HexColor('#16213e')
-            ),
-            'heading2': ParagraphStyle(
-                'Heading2',
-                parent=base_styles['Heading2'],
-                fontName=self.font_name,
-                fontSize=14,
-                leading=18,
-                spaceBefore=15,
-                spaceAfter=8,
-                textColor=HexColor('#0f3460')
-            ),
-            'body': ParagraphStyle(
-                'Body',
-                parent=base_styles['Normal'],
-                fontName=self.font_name,
-                fontSize=11,
-                leading=16,
-                spaceAfter=10,
-                textColor=HexColor('#333333')
-            ),
-            'highlight': ParagraphStyle(
-                'Highlight',
-                parent=base_styles['Normal'],
-                fontName=self.font_name,
-                fontSize=11,
-                leading=16,
-                backColor=HexColor('#f0f4f8'),
-                borderPadding=10,
-                spaceAfter=10
-            ),
-            'footer': ParagraphStyle(
-                'Footer',
-                parent=base_styles['Normal'],
-                fontName=self.font_name,
-                fontSize=9,
-                textColor=HexColor('#999999'),
-                alignment=1
-            )
-        }
-        
-        return styles
+        """创建文档样式（同一字体复用缓存的样式对象）"""
+        return _build_styles(self.font_name)
     
     def generate_report_pdf(self, report: Dict[str, Any], output_path: str):
         """
@@ -216,20 +399,19 @@ class PDFGenerator:
             leftMargin=2*cm,
             rightMargin=2*cm,
             topMargin=2*cm,
-            bottomMargin=2*cm
+            bottomMargin=2*cm,
+            # 显式开启内容流压缩，不受 reportlab_settings 覆盖影响
+            pageCompression=1
         )
         
         story = []
-        temp_files = []  # 收集需要清理的临时文件
         
         # 添加封面
         story.extend(self._create_cover(report))
         story.append(PageBreak())
         
         # 添加评分概览
-        overview_elements, overview_temps = self._create_score_overview(report)
-        story.extend(overview_elements)
-        temp_files.extend(overview_temps)
+        story.extend(self._create_score_overview(report))
         story.append(PageBreak())
         
         # 添加目录
@@ -250,16 +432,7 @@ class PDFGenerator:
         story.extend(self._create_disclaimer())
         
         # 生成 PDF
-        try:
-            doc.build(story)
-        finally:
-            # 清理临时文件
-            for path in temp_files:
-                if path and os.path.exists(path):
-                    try:
-                        os.unlink(path)
-                    except:
-                        pass
+        doc.build(story)
     
     def _get_metadata(self, report: Dict[str, Any]) -> Dict[str, Any]:
         """获取报告 metadata"""
@@ -274,7 +447,9 @@ class PDFGenerator:
         elements.append(Spacer(1, 100))
         
         # 标题 - 从 metadata 中获取公司名称
-        company = metadata.get('company_name') or metadata.get('company') or report.get('company', '未知公司')
+        company = _first_value(
+            ((metadata, 'company_name'), (metadata, 'company'), (report, 'company')), '未知公司'
+        )
         elements.append(Paragraph(
             f"{company}",
             self.styles['title']
@@ -288,7 +463,7 @@ class PDFGenerator:
         elements.append(Spacer(1, 30))
         
         # 副标题信息
-        stock_code = metadata.get('stock_code') or report.get('stock_code', '')
+        stock_code = _first_value(((metadata, 'stock_code'), (report, 'stock_code')), '')
         if stock_code:
             elements.append(Paragraph(
                 f"股票代码：{stock_code}",
@@ -303,13 +478,9 @@ class PDFGenerator:
                 self.styles['subtitle']
             ))
         
-        research_date = metadata.get('research_date') or report.get('research_date', datetime.now().isoformat())
+        research_date = _first_value(((metadata, 'research_date'), (report, 'research_date'))) or datetime.now()
         if isinstance(research_date, str):
-            try:
-                date_obj = datetime.fromisoformat(research_date.replace('Z', '+00:00'))
-                date_str = date_obj.strftime('%Y年%m月%d日')
-            except:
-                date_str = research_date[:10]
+            date_str = _format_iso_date(research_date)
         else:
             date_str = research_date.strftime('%Y年%m月%d日')
         
@@ -328,10 +499,9 @@ class PDFGenerator:
         
         return elements
     
-    def _create_score_overview(self, report: Dict[str, Any]) -> tuple:
-        """创建评分概览页，返回 (元素列表, 临时文件列表)"""
+    def _create_score_overview(self, report: Dict[str, Any]) -> List:
+        """创建评分概览页"""
         elements = []
-        temp_files = []
         metadata = self._get_metadata(report)
         sections = report.get('sections', [])
         
@@ -342,44 +512,48 @@ class PDFGenerator:
         overall_score = metadata.get('overall_score', 5)
         recommendation = metadata.get('recommendation', '观望')
         
+        # 按 id 索引章节（只遍历一次；id 重复时以第一个为准）
+        section_by_id = {}
+        for section in sections:
+            section_by_id.setdefault(section.get('id'), section)
+        
         # 准备多维度数据
+        financial_score = section_by_id.get('financial_analysis', {}).get('overall_score', 5)
+        market_score = section_by_id.get('market_analysis', {}).get('overall_score', 5)
         dimensions = [
-            ('财务分析', self._get_section_score(sections, 'financial_analysis')),
-            ('市场分析', self._get_section_score(sections, 'market_analysis')),
-            ('风险控制', self._calc_risk_score(sections)),
-            ('投资价值', overall_score),
-            ('成长潜力', round((self._get_section_score(sections, 'financial_analysis') + 
-                            self._get_section_score(sections, 'market_analysis')) / 2)),
+            ('财务分析', financial_score),
+            ('市场分析', market_score),
         ]
+        # 未做洞察提炼的报告没有风险评估章节，不给出风险控制评分
+        risk_section = section_by_id.get('risk_assessment')
+        if risk_section is not None:
+            dimensions.append(('风险控制', self._calc_risk_score(risk_section)))
+        dimensions.extend([
+            ('投资价值', overall_score),
+            ('成长潜力', round((financial_score + market_score) / 2)),
+        ])
         
         # 生成仪表盘图
-        gauge_path = self._create_gauge_chart(overall_score, recommendation)
-        if gauge_path:
-            temp_files.append(gauge_path)
+        gauge = self._create_gauge_chart(overall_score, recommendation)
         
         # 生成雷达图
-        radar_path = self._create_radar_chart(dimensions)
-        if radar_path:
-            temp_files.append(radar_path)
+        radar = self._create_radar_chart(dimensions)
         
-        # 使用表格并排显示两个图表
+        # 使用表格并排显示两个图表（矢量图形直接写入 PDF）
         chart_row = []
-        if gauge_path and os.path.exists(gauge_path):
-            chart_row.append(Image(gauge_path, width=180, height=135))
+        if gauge:
+            chart_row.append(gauge)
         else:
             chart_row.append(Paragraph(f"综合评分: {overall_score}/10", self.styles['body']))
         
-        if radar_path and os.path.exists(radar_path):
-            chart_row.append(Image(radar_path, width=220, height=220))
+        if radar:
+            chart_row.append(radar)
         else:
             chart_row.append(Paragraph("多维度评分分析", self.styles['body']))
         
         if chart_row:
             chart_table = Table([chart_row], colWidths=[200, 250])
-            chart_table.setStyle(TableStyle([
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ]))
+            chart_table.setStyle(self.table_styles['chart'])
             elements.append(chart_table)
             elements.append(Spacer(1, 20))
         
@@ -393,186 +567,42 @@ class PDFGenerator:
             dimension_data.append([dim_name, f"{dim_score} / 10", rating])
         
         dim_table = Table(dimension_data, colWidths=[150, 100, 100])
-        dim_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), HexColor('#16213e')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), white),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, -1), self.font_name),
-            ('FONTSIZE', (0, 0), (-1, -1), 11),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
-            ('TOPPADDING', (0, 0), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 1, HexColor('#dddddd')),
-        ]))
+        dim_table.setStyle(self.table_styles['dimension'])
         elements.append(dim_table)
         
-        return elements, temp_files
-    
-    def _get_score_color(self, score: float) -> HexColor:
-        """根据评分返回颜色"""
-        if score >= 8:
-            return HexColor('#10b981')
-        elif score >= 6:
-            return HexColor('#f59e0b')
-        else:
-            return HexColor('#ef4444')
-    
-    def _get_section_score(self, sections: List, section_id: str) -> float:
-        """获取章节评分"""
-        for section in sections:
-            if section.get('id') == section_id:
-                return section.get('overall_score', 5)
-        return 5
+        return elements
     
-    def _calc_risk_score(self, sections: List) -> float:
+    def _calc_risk_score(self, risk_section: Optional[Dict[str, Any]]) -> float:
         """计算风险评分（风险越少分越高）"""
-        for section in sections:
-            if section.get('id') == 'risk_assessment':
-                risk_count = len(section.get('risks', []))
-                return max(10 - risk_count * 2, 3)
-        return 5
+        if risk_section is None:
+            return 5
+        risk_count = len(risk_section.get('risks', []))
+        return max(10 - risk_count * 2, 3)
     
-    def _create_radar_chart(self, dimensions: List[tuple]) -> str:
+    def _create_radar_chart(self, dimensions: List[tuple]) -> Optional[Drawing]:
         """
-        创建雷达图并返回临时文件路径
+        创建雷达图
         
         Args:
             dimensions: [(维度名, 分数), ...]
         
         Returns:
-            临时图片文件路径
+            雷达图 Drawing
         """
         try:
-            # 获取中文字体
-            font_prop = _get_chinese_font()
-            
-            # 准备数据
-            labels = [d[0] for d in dimensions]
-            values = [d[1] for d in dimensions]
-            num_vars = len(labels)
-            
-            # 计算角度
-            angles = np.linspace(0, 2 * np.pi, num_vars, endpoint=False).tolist()
-            values += values[:1]  # 闭合多边形
-            angles += angles[:1]
-            
-            # 创建图表
-            fig, ax = plt.subplots(figsize=(6, 6), subplot_kw=dict(polar=True))
-            
-            # 绘制雷达图
-            ax.fill(angles, values, color='#6366f1', alpha=0.25)
-            ax.plot(angles, values, color='#6366f1', linewidth=2)
-            ax.scatter(angles[:-1], values[:-1], color='#6366f1', s=50, zorder=5)
-            
-            # 设置标签 (使用中文字体)
-            ax.set_xticks(angles[:-1])
-            if font_prop:
-                ax.set_xticklabels(labels, size=12, fontproperties=font_prop)
-            else:
-                ax.set_xticklabels(labels, size=12)
-            
-            # 设置刻度范围
-            ax.set_ylim(0, 10)
-            ax.set_yticks([2, 4, 6, 8, 10])
-            ax.set_yticklabels(['2', '4', '6', '8', '10'], size=8, color='gray')
-            
-            # 设置网格样式
-            ax.grid(color='#e5e7eb', linestyle='-', linewidth=0.5)
-            ax.spines['polar'].set_color('#d1d5db')
-            
-            # 添加标题 (使用中文字体)
-            if font_prop:
-                ax.set_title('多维度评分分析', size=14, fontweight='bold', pad=20, fontproperties=font_prop)
-            else:
-                ax.set_title('Score Analysis', size=14, fontweight='bold', pad=20)
-            
-            # 保存到临时文件
-            temp_file = tempfile.NamedTemporaryFile(suffix='.png', delete=False)
-            plt.savefig(temp_file.name, dpi=150, bbox_inches='tight', 
-                       facecolor='white', edgecolor='none')
-            plt.close(fig)
-            
-            return temp_file.name
+            return _draw_radar(tuple(dimensions), self.font_name)
         except Exception as e:
-            print(f"雷达图生成失败: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("雷达图生成失败: %s", e)
             return None
     
-    def _create_gauge_chart(self, score: float, recommendation: str) -> str:
+    def _create_gauge_chart(self, score: float, recommendation: str) -> Optional[Drawing]:
         """
-        创建仪表盘图并返回临时文件路径
+        创建仪表盘图并返回 Drawing
         """
         try:
-            # 获取中文字体
-            font_prop = _get_chinese_font()
-            
-            fig, ax = plt.subplots(figsize=(4, 3))
-            
-            # 确定颜色
-            if score >= 8:
-                color = '#10b981'
-            elif score >= 6:
-                color = '#f59e0b'
-            else:
-                color = '#ef4444'
-            
-            # 绘制半圆进度条
-            theta = np.linspace(0, np.pi, 100)
-            r = 1
-            
-            # 背景弧
-            ax.fill_between(theta, 0.7, 1, alpha=0.1, color='gray')
-            
-            # 进度弧
-            progress_angle = np.pi * (score / 10)
-            theta_progress = np.linspace(0, progress_angle, 100)
-            ax.fill_between(theta_progress, 0.7, 1, alpha=0.8, color=color)
-            
-            # 设置为极坐标效果
-            ax.set_xlim(-0.2, np.pi + 0.2)
-            ax.set_ylim(0, 1.5)
-            ax.set_aspect('equal')
-            ax.axis('off')
-            
-            # 添加分数文本
-            ax.text(np.pi/2, 0.3, f'{score}', ha='center', va='center', 
-                   fontsize=36, fontweight='bold', color=color)
-            
-            # 添加"综合评分"文本 (使用中文字体)
-            if font_prop:
-                ax.text(np.pi/2, 0, '综合评分', ha='center', va='center', 
-                       fontsize=12, color='gray', fontproperties=font_prop)
-            else:
-                ax.text(np.pi/2, 0, 'Score', ha='center', va='center', 
-                       fontsize=12, color='gray')
-            
-            # 添加建议标签 (使用中文字体)
-            rec_colors = {
-                '买入': '#10b981', '持有': '#f59e0b', 
-                '卖出': '#ef4444', '观望': '#6b7280'
-            }
-            rec_color = rec_colors.get(recommendation, '#6b7280')
-            if font_prop:
-                ax.text(np.pi/2, -0.3, recommendation, ha='center', va='center',
-                       fontsize=14, fontweight='bold', color=rec_color,
-                       fontproperties=font_prop,
-                       bbox=dict(boxstyle='round,pad=0.3', facecolor=rec_color, alpha=0.15))
-            else:
-                ax.text(np.pi/2, -0.3, recommendation, ha='center', va='center',
-                       fontsize=14, fontweight='bold', color=rec_color,
-                       bbox=dict(boxstyle='round,pad=0.3', facecolor=rec_color, alpha=0.15))
-            
-            # 保存
-            temp_file = tempfile.NamedTemporaryFile(suffix='.png', delete=False)
-            plt.savefig(temp_file.name, dpi=150, bbox_inches='tight',
-                       facecolor='white', edgecolor='none')
-            plt.close(fig)
-            
-            return temp_file.name
+            return _draw_gauge(score, recommendation, self.font_name)
         except Exception as e:
-            print(f"仪表盘图生成失败: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("仪表盘图生成失败: %s", e)
             return None
     
     def _create_swot_table(self, swot: Dict[str, Any]) -> List:
@@ -601,32 +631,7 @@ class PDFGenerator:
         ]
         
         swot_table = Table(swot_data, colWidths=[230, 230])
-        swot_table.setStyle(TableStyle([
-            # 标题行样式
-            ('BACKGROUND', (0, 0), (0, 0), HexColor('#10b981')),
-            ('BACKGROUND', (1, 0), (1, 0), HexColor('#f59e0b')),
-            ('BACKGROUND', (0, 2), (0, 2), HexColor('#3b82f6')),
-            ('BACKGROUND', (1, 2), (1, 2), HexColor('#ef4444')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), white),
-            ('TEXTCOLOR', (0, 2), (-1, 2), white),
-            # 内容行样式
-            ('BACKGROUND', (0, 1), (0, 1), HexColor('#ecfdf5')),
-            ('BACKGROUND', (1, 1), (1, 1), HexColor('#fffbeb')),
-            ('BACKGROUND', (0, 3), (0, 3), HexColor('#eff6ff')),
-            ('BACKGROUND', (1, 3), (1, 3), HexColor('#fef2f2')),
-            # 通用样式
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-            ('FONTNAME', (0, 0), (-1, -1), self.font_name),
-            ('FONTSIZE', (0, 0), (-1, 0), 11),
-            ('FONTSIZE', (0, 2), (-1, 2), 11),
-            ('FONTSIZE', (0, 1), (-1, 1), 10),
-            ('FONTSIZE', (0, 3), (-1, 3), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
-            ('TOPPADDING', (0, 0), (-1, -1), 10),
-            ('LEFTPADDING', (0, 0), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 1, HexColor('#dddddd')),
-        ]))
+        swot_table.setStyle(self.table_styles['swot'])
         elements.append(swot_table)
         
         return elements
@@ -638,23 +643,29 @@ class PDFGenerator:
         elements.append(Paragraph("目 录", self.styles['heading1']))
         elements.append(Spacer(1, 20))
         
+        # 全部目录项合并为一个段落，以 <br/> 换行，整体只排版一次
+        lines = []
         for i, section in enumerate(report.get('sections', []), 1):
             title = section.get('title', '')
-            elements.append(Paragraph(
-                f"{i}. {title}",
-                self.styles['body']
-            ))
+            lines.append(f"{i}. {escape(str(title))}")
             
             # 二级标题
             for j, subsection in enumerate(section.get('subsections', []), 1):
                 sub_title = subsection.get('title', '')
-                elements.append(Paragraph(
-                    f"    {i}.{j} {sub_title}",
-                    self.styles['body']
-                ))
+                lines.append(f"&nbsp;&nbsp;&nbsp;&nbsp;{i}.{j} {escape(str(sub_title))}")
+        
+        if lines:
+            elements.append(Paragraph("<br/>".join(lines), self.styles['body']))
         
         return elements
     
+    def _create_bullets(self, items: List) -> Paragraph:
+        """将列表项合并为一个以 <br/> 换行的段落"""
+        return Paragraph(
+            "<br/>".join(f"• {escape(str(item))}" for item in items),
+            self.styles['body']
+        )
+    
     def _create_section(self, section: Dict[str, Any]) -> List:
         """创建章节内容"""
         elements = []
@@ -672,8 +683,7 @@ class PDFGenerator:
         if key_points:
             elements.append(Spacer(1, 10))
             elements.append(Paragraph("要点：", self.styles['heading2']))
-            for point in key_points:
-                elements.append(Paragraph(f"• {point}", self.styles['body']))
+            elements.append(self._create_bullets(key_points))
         
         # 子章节
         for subsection in section.get('subsections', []):
@@ -709,18 +719,7 @@ class PDFGenerator:
                     risk_data.append(['风险', str(risk), '中'])
             
             risk_table = Table(risk_data, colWidths=[80, 280, 60])
-            risk_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), HexColor('#dc2626')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), white),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('ALIGN', (2, 0), (2, -1), 'CENTER'),
-                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                ('FONTNAME', (0, 0), (-1, -1), self.font_name),
-                ('FONTSIZE', (0, 0), (-1, -1), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-                ('TOPPADDING', (0, 0), (-1, -1), 8),
-                ('GRID', (0, 0), (-1, -1), 1, HexColor('#dddddd')),
-            ]))
+            risk_table.setStyle(self.table_styles['risk'])
             elements.append(risk_table)
         
         # 投资建议特殊处理
@@ -737,8 +736,7 @@ class PDFGenerator:
         catalysts = section.get('catalysts', [])
         if catalysts:
             elements.append(Paragraph("上涨催化剂：", self.styles['heading2']))
-            for catalyst in catalysts:
-                elements.append(Paragraph(f"• {catalyst}", self.styles['body']))
+            elements.append(self._create_bullets(catalysts))
         
         return elements
     
@@ -771,4 +769,12 @@ class PDFGenerator:
         return elements
 
 
+@lru_cache(maxsize=1)
+def get_pdf_generator() -> PDFGenerator:
+    """获取进程内共享的 PDF 生成器"""
+    return PDFGenerator()
+
 
+def warm_up():
+    """预热：注册字体并创建样式"""
+    get_pdf_generator()
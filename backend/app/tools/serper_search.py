@@ -1,20 +1,117 @@
 """Google Serper API 搜索工具"""
-import logging
+import asyncio
 from datetime import datetime, timedelta
 
 import httpx
-from typing import List, Dict, Any, Optional
+import orjson
+from typing import Awaitable, List, Dict, Any, Optional, Tuple
 from ..config import get_settings
+from ..utils.ttl_cache import TTLCache
+from ..utils.log import get_logger
+
+logger = get_logger(__name__)
 
 settings = get_settings()
 
+# 进程内共享的 HTTP 客户端（复用到 google.serper.dev 的 TCP/TLS 连接，
+# HTTP/2 下并发请求在少量连接上多路复用）
+_client: Optional[httpx.AsyncClient] = None
+
+# 限制同时进行的请求数，避免突发并发触发 API 限流（429）
+# (事件循环, 信号量)：信号量绑定事件循环，换循环（如多次 asyncio.run）时重新创建
+_request_semaphore: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = None
+
+SEARCH_URL = "https://google.serper.dev/search"
+NEWS_URL = "https://google.serper.dev/news"
+
+# 查询结果缓存：新闻时效性强缓存 30 分钟，其余（公司信息、财务、行业）缓存 24 小时
+_CACHE_TTLS = {
+    NEWS_URL: 30 * 60,
+}
+_DEFAULT_CACHE_TTL = 24 * 60 * 60
+_result_cache = TTLCache(maxsize=1024, ttl=_DEFAULT_CACHE_TTL)
+
+# 正在进行的请求，相同查询并发到达时共享同一个请求
+_inflight: Dict[tuple, "asyncio.Task"] = {}
+
+
+def _get_client() -> httpx.AsyncClient:
+    """获取共享 HTTP 客户端（首次使用时创建）"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=30.0,
+            headers={
+                "X-API-KEY": settings.serper_api_key,
+                "Content-Type": "application/json"
+            },
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=4, max_connections=8)
+        )
+    return _client
+
+
+def _get_request_semaphore() -> asyncio.Semaphore:
+    """获取当前事件循环的请求并发信号量"""
+    global _request_semaphore
+    loop = asyncio.get_running_loop()
+    if _request_semaphore is None or _request_semaphore[0] is not loop:
+        _request_semaphore = (loop, asyncio.Semaphore(settings.serper_concurrency or 8))
+    return _request_semaphore[1]
+
+
+async def close_client():
+    """关闭共享 HTTP 客户端（应用关闭时调用）"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+async def _safe(coro: Awaitable) -> Dict[str, Any]:
+    """等待搜索协程，失败时返回空字典"""
+    try:
+        return await coro
+    except Exception:
+        return {}
+
 
 class SerperSearchTool:
     """Google Serper API 搜索工具"""
     
     def __init__(self):
         self.api_key = settings.serper_api_key
-        self.base_url = "https://google.serper.dev/search"
+        self.base_url = SEARCH_URL
+    
+    async def _post(self, url: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        发送查询并返回 JSON
+        
+        命中缓存直接返回；相同查询正在请求中时等待同一个请求，不重复发送。
+        返回的结果字典可能被多个调用方共享，调用方不应修改。
+        """
+        key = (url, payload["q"], payload["num"], payload.get("tbs"))
+        cached = _result_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        task = _inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch(key, url, payload))
+            _inflight[key] = task
+            task.add_done_callback(lambda _: _inflight.pop(key, None))
+        # shield：某个调用方被取消时不影响共享同一请求的其他调用方
+        return await asyncio.shield(task)
+    
+    async def _fetch(self, key: tuple, url: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """通过共享连接池发送请求（受并发上限约束），成功后写入缓存"""
+        async with _get_request_semaphore():
+            response = await _get_client().post(url, json=payload)
+        response.raise_for_status()
+        # 直接解析响应字节，跳过文本解码
+        result = orjson.loads(response.content)
+        _result_cache.set(key, result, _CACHE_TTLS.get(url, _DEFAULT_CACHE_TTL))
+        return result
     
     async def search(
         self,
@@ -47,18 +144,24 @@ class SerperSearchTool:
         if time_range:
             search_params["tbs"] = f"qdr:{time_range}"  # qdr:d(天), qdr:w(周), qdr:m(月), qdr:y(年)
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                self.base_url,
-                json=search_params,
-                headers={
-                    "X-API-KEY": self.api_key,
-                    "Content-Type": "application/json"
-                }
-            )
-            response.raise_for_status()
-            print(f"results: {response.json()}")
-            return response.json()
+        result = await self._post(self.base_url, search_params)
+        logger.debug("results: %s", result)
+        return result
+    
+    async def _gather_queries(self, queries: List[str], **kwargs) -> List[Dict[str, Any]]:
+        """并发执行一组查询，返回成功的结果（保持查询顺序）"""
+        results = await asyncio.gather(
+            *(self.search(query, **kwargs) for query in queries),
+            return_exceptions=True
+        )
+        
+        collected = []
+        for query, result in zip(queries, results):
+            if isinstance(result, Exception):
+                logger.warning("搜索失败: %s, 错误: %s", query, result)
+            else:
+                collected.append(result)
+        return collected
     
     async def search_company_info(self, company: str) -> Dict[str, Any]:
         """搜索公司基本信息"""
@@ -67,19 +170,13 @@ class SerperSearchTool:
             f"{company} 公司官网 企业介绍",
         ]
         
-        results = []
-        for query in queries:
-            try:
-                result = await self.search(query, num_results=5)
-                results.append(result)
-            except Exception as e:
-                print(f"搜索失败: {query}, 错误: {e}")
+        results = await self._gather_queries(queries, num_results=5)
         
         return {"type": "company_info", "results": results}
     
-    async def search_financial_data(self, company: str) -> Dict[str, Any]:
+    async def search_financial_data(self, company: str, year: Optional[int] = None) -> Dict[str, Any]:
         """搜索财务数据（优先最新数据）"""
-        current_year = datetime.now().year
+        current_year = year or datetime.now().year
         last_year = current_year - 1
         
         # 优先搜索最新年份的财务数据
@@ -90,14 +187,8 @@ class SerperSearchTool:
             f"{company} 股票 市值 估值 最新",
         ]
         
-        results = []
-        for query in queries:
-            try:
-                # 财务数据优先搜索最近一年的
-                result = await self.search(query, num_results=5, time_range="y")
-                results.append(result)
-            except Exception as e:
-                print(f"搜索失败: {query}, 错误: {e}")
+        # 财务数据优先搜索最近一年的
+        results = await self._gather_queries(queries, num_results=5, time_range="y")
         
         return {"type": "financial_data", "results": results}
     
@@ -122,137 +213,95 @@ class SerperSearchTool:
         query = f"{company} {time_keyword} 新闻 动态"
         
         try:
+            # 新闻API可能支持时间参数
+            news_params = {
+                "q": query,
+                "num": 10,
+                "gl": "cn",
+                "hl": "zh-cn",
+            }
+            
+            # 尝试添加时间范围（如果API支持）
+            if days <= 7:
+                news_params["tbs"] = "qdr:d"  # 最近一天
+            elif days <= 30:
+                news_params["tbs"] = "qdr:w"  # 最近一周
+            elif days <= 90:
+                news_params["tbs"] = "qdr:m"  # 最近一个月
+            
             # 使用新闻搜索
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                # 新闻API可能支持时间参数
-                news_params = {
-                    "q": query,
-                    "num": 10,
-                    "gl": "cn",
-                    "hl": "zh-cn",
-                }
-                
-                # 尝试添加时间范围（如果API支持）
-                if days <= 7:
-                    news_params["tbs"] = "qdr:d"  # 最近一天
-                elif days <= 30:
-                    news_params["tbs"] = "qdr:w"  # 最近一周
-                elif days <= 90:
-                    news_params["tbs"] = "qdr:m"  # 最近一个月
-                
-                response = await client.post(
-                    "https://google.serper.dev/news",
-                    json=news_params,
-                    headers={
-                        "X-API-KEY": self.api_key,
-                        "Content-Type": "application/json"
-                    }
-                )
-                response.raise_for_status()
-                return {"type": "news", "results": response.json()}
+            result = await self._post(NEWS_URL, news_params)
+            return {"type": "news", "results": result}
         except Exception as e:
-            print(f"新闻搜索失败: {e}")
+            logger.warning("新闻搜索失败: %s", e)
             return {"type": "news", "results": [], "error": str(e)}
     
-    async def search_industry_analysis(self, company: str) -> Dict[str, Any]:
+    async def search_industry_analysis(self, company: str, year: Optional[int] = None) -> Dict[str, Any]:
         """搜索行业分析（优先最新分析）"""
-        current_year = datetime.now().year
+        current_year = year or datetime.now().year
         queries = [
             f"{company} {current_year}年 行业分析 市场地位",
             f"{company} 最新 竞争对手 行业格局",
             f"{company} 行业趋势 发展前景 {current_year}",
         ]
         
-        results = []
-        for query in queries:
-            try:
-                # 行业分析优先搜索最近一年的
-                result = await self.search(query, num_results=5, time_range="y")
-                results.append(result)
-            except Exception as e:
-                print(f"搜索失败: {query}, 错误: {e}")
+        # 行业分析优先搜索最近一年的
+        results = await self._gather_queries(queries, num_results=5, time_range="y")
         
         return {"type": "industry_analysis", "results": results}
     
+    async def _collect(self, company: str, tasks: Dict[str, Awaitable]) -> Dict[str, Any]:
+        """并行执行各类搜索，按键名组装结果（失败的类别为空字典）"""
+        values = await asyncio.gather(*(_safe(task) for task in tasks.values()))
+        return {"company": company, **dict(zip(tasks, values))}
+    
     async def collect_basic_data(self, company: str) -> Dict[str, Any]:
         """收集基础数据 (basic 深度)"""
-        import asyncio
-        
-        print(f"[SerperSearch] 基础数据收集: {company}")
+        logger.info("基础数据收集: %s", company)
         
         # 只收集公司基本信息和最新新闻
-        tasks = [
-            self.search_company_info(company),
-            self.search_recent_news(company),
-        ]
-        
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        return {
-            "company": company,
-            "company_info": results[0] if not isinstance(results[0], Exception) else {},
-            "financial_data": {},  # 基础模式不收集财务数据
-            "news": results[1] if not isinstance(results[1], Exception) else {},
-            "industry_analysis": {},  # 基础模式不收集行业分析
-        }
+        data = await self._collect(company, {
+            "company_info": self.search_company_info(company),
+            "news": self.search_recent_news(company),
+        })
+        data["financial_data"] = {}  # 基础模式不收集财务数据
+        data["industry_analysis"] = {}  # 基础模式不收集行业分析
+        return data
     
     async def collect_all_data(self, company: str) -> Dict[str, Any]:
         """收集标准数据 (standard 深度)"""
-        import asyncio
-        
-        print(f"[SerperSearch] 标准数据收集: {company}")
+        logger.info("标准数据收集: %s", company)
+        # 年份只取一次，同一次收集中各查询的年份一致
+        year = datetime.now().year
         
         # 并行执行所有搜索
-        tasks = [
-            self.search_company_info(company),
-            self.search_financial_data(company),
-            self.search_recent_news(company),
-            self.search_industry_analysis(company),
-        ]
-        
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        return {
-            "company": company,
-            "company_info": results[0] if not isinstance(results[0], Exception) else {},
-            "financial_data": results[1] if not isinstance(results[1], Exception) else {},
-            "news": results[2] if not isinstance(results[2], Exception) else {},
-            "industry_analysis": results[3] if not isinstance(results[3], Exception) else {},
-        }
+        return await self._collect(company, {
+            "company_info": self.search_company_info(company),
+            "financial_data": self.search_financial_data(company, year),
+            "news": self.search_recent_news(company),
+            "industry_analysis": self.search_industry_analysis(company, year),
+        })
     
     async def collect_deep_data(self, company: str) -> Dict[str, Any]:
         """收集深度数据 (deep 深度)"""
-        import asyncio
-        
-        print(f"[SerperSearch] 深度数据收集: {company}")
+        logger.info("深度数据收集: %s", company)
+        # 年份只取一次，同一次收集中各查询的年份一致
+        year = datetime.now().year
         
         # 深度模式: 更多搜索查询
-        tasks = [
-            self.search_company_info(company),
-            self.search_financial_data(company),
-            self.search_recent_news(company),
-            self.search_industry_analysis(company),
-            self._search_deep_financials(company),
-            self._search_management_team(company),
-            self._search_risk_factors(company),
-        ]
-        
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        return {
-            "company": company,
-            "company_info": results[0] if not isinstance(results[0], Exception) else {},
-            "financial_data": results[1] if not isinstance(results[1], Exception) else {},
-            "news": results[2] if not isinstance(results[2], Exception) else {},
-            "industry_analysis": results[3] if not isinstance(results[3], Exception) else {},
-            "deep_financials": results[4] if not isinstance(results[4], Exception) else {},
-            "management": results[5] if not isinstance(results[5], Exception) else {},
-            "risk_factors": results[6] if not isinstance(results[6], Exception) else {},
-        }
+        return await self._collect(company, {
+            "company_info": self.search_company_info(company),
+            "financial_data": self.search_financial_data(company, year),
+            "news": self.search_recent_news(company),
+            "industry_analysis": self.search_industry_analysis(company, year),
+            "deep_financials": self._search_deep_financials(company, year),
+            "management": self._search_management_team(company),
+            "risk_factors": self._search_risk_factors(company, year),
+        })
     
-    async def _search_deep_financials(self, company: str) -> Dict[str, Any]:
+    async def _search_deep_financials(self, company: str, year: Optional[int] = None) -> Dict[str, Any]:
         """深度搜索财务数据（优先最新数据）"""
-        current_year = datetime.now().year
+        current_year = year or datetime.now().year
         last_year = current_year - 1
         queries = [
             f"{company} {current_year}年 资产负债表 详细",
@@ -261,14 +310,8 @@ class SerperSearchTool:
             f"{company} {current_year}年 应收账款 存货周转",
         ]
         
-        results = []
-        for query in queries:
-            try:
-                # 财务数据优先搜索最近一年的
-                result = await self.search(query, num_results=5, time_range="y")
-                results.append(result)
-            except Exception as e:
-                print(f"搜索失败: {query}, 错误: {e}")
+        # 财务数据优先搜索最近一年的
+        results = await self._gather_queries(queries, num_results=5, time_range="y")
         
         return {"type": "deep_financials", "results": results}
     
@@ -279,43 +322,38 @@ class SerperSearchTool:
             f"{company} 董事长 CEO 简历",
         ]
         
-        results = []
-        for query in queries:
-            try:
-                result = await self.search(query, num_results=5)
-                results.append(result)
-            except Exception as e:
-                print(f"搜索失败: {query}, 错误: {e}")
+        results = await self._gather_queries(queries, num_results=5)
         
         return {"type": "management", "results": results}
     
-    async def _search_risk_factors(self, company: str) -> Dict[str, Any]:
+    async def _search_risk_factors(self, company: str, year: Optional[int] = None) -> Dict[str, Any]:
         """搜索风险因素（优先最新风险）"""
-        current_year = datetime.now().year
+        current_year = year or datetime.now().year
         queries = [
             f"{company} {current_year}年 风险提示 风险因素",
             f"{company} 最新 诉讼 监管 处罚",
             f"{company} 最近 风险事件 负面新闻",
         ]
         
-        results = []
-        for query in queries:
-            try:
-                # 风险因素优先搜索最近一年的
-                result = await self.search(query, num_results=5, time_range="y")
-                results.append(result)
-            except Exception as e:
-                print(f"搜索失败: {query}, 错误: {e}")
+        # 风险因素优先搜索最近一年的
+        results = await self._gather_queries(queries, num_results=5, time_range="y")
         
         return {"type": "risk_factors", "results": results}
 
 
+# Agno 工具共享的搜索实例（首次创建工具时初始化）
+_default_tool: Optional[SerperSearchTool] = None
+
+
 # Agno Tool 包装器
 def create_serper_tool():
     """创建 Agno 兼容的搜索工具"""
     from agno.tools import tool
+    global _default_tool
     
-    searcher = SerperSearchTool()
+    if _default_tool is None:
+        _default_tool = SerperSearchTool()
+    searcher = _default_tool
     
     @tool(name="web_search", description="使用 Google 搜索网络信息")
     async def web_search(query: str, num_results: int = 10) -> str:
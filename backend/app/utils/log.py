@@ -0,0 +1,87 @@
+"""后台日志 - 日志格式化与输出在独立线程中完成，不阻塞事件循环"""
+import atexit
+import logging
+import queue
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional, Tuple
+
+from ..config import get_settings
+
+_log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+_listener: Optional[QueueListener] = None
+
+# 同一位置的同一条日志在该间隔（秒）内只输出一次
+RATE_LIMIT_INTERVAL = 1.0
+# 限流状态条目上限，超过时清理已过间隔的条目
+RATE_LIMIT_MAX_KEYS = 4096
+
+
+class _RateLimitFilter(logging.Filter):
+    """
+    重复日志限流
+    
+    按 (logger, 代码位置, 格式化后的消息, 异常类型) 限流，间隔内完全相同的记录直接丢弃，
+    下一次输出时附带被丢弃的条数。ERROR 同样限流（失败路径上重复的 logger.exception
+    正是日志风暴的来源），不同的消息或异常类型互不影响。在入队前执行。
+    """
+    
+    def __init__(self, interval: float = RATE_LIMIT_INTERVAL):
+        super().__init__()
+        self.interval = interval
+        # {key: (上次输出时间, 被丢弃条数)}
+        self._state: Dict[Tuple[str, str, int, str, Optional[type]], Tuple[float, int]] = {}
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        exc_type = record.exc_info[0] if record.exc_info else None
+        key = (record.name, record.pathname, record.lineno, record.getMessage(), exc_type)
+        now = time.monotonic()
+        last, suppressed = self._state.get(key, (0.0, 0))
+        if now - last < self.interval:
+            self._state[key] = (last, suppressed + 1)
+            return False
+        self._state[key] = (now, 0)
+        if len(self._state) > RATE_LIMIT_MAX_KEYS:
+            # 按格式化后的消息计键，条目随参数增长，定期清理
+            self._state = {k: v for k, v in self._state.items() if now - v[0] < self.interval}
+        if suppressed:
+            record.msg = f"{record.msg}（已抑制 {suppressed} 条重复日志）"
+        return True
+
+
+class _BackgroundQueueHandler(QueueHandler):
+    """直接入队原始记录，格式化（包括异常堆栈）留给后台线程"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def _ensure_listener():
+    """启动后台日志线程（进程内只启动一次）"""
+    global _listener
+    if _listener is not None:
+        return
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(name)s: %(message)s"))
+    _listener = QueueListener(_log_queue, handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    获取写入后台队列的 logger
+    
+    后台队列处理器只挂在顶层包 logger（如 "app"）上，各模块 logger 向上传播。
+    级别仅在宿主未配置该包 logger 时按 LOG_LEVEL 设置，不修改 propagate，
+    宿主的 logging 配置优先。
+    """
+    _ensure_listener()
+    package_logger = logging.getLogger(name.partition(".")[0])
+    if not any(isinstance(h, _BackgroundQueueHandler) for h in package_logger.handlers):
+        handler = _BackgroundQueueHandler(_log_queue)
+        handler.addFilter(_RateLimitFilter())
+        package_logger.addHandler(handler)
+        if package_logger.level == logging.NOTSET:
+            package_logger.setLevel(get_settings().log_level.upper())
+    return logging.getLogger(name)
@@ -1,21 +1,110 @@
 """流式 LLM 调用工具"""
 import asyncio
-from typing import Callable, Optional
+from typing import Awaitable, Callable, List, Optional, Tuple
 from openai import AsyncOpenAI
 from ..config import get_settings
 
 settings = get_settings()
 
+# 流式回调的默认批量策略：累计达到字符数或距上次回调超过间隔（秒）即回调一次
+# （对话中的每次回调直接推送一帧 WebSocket，这里是流式输出唯一的合并层）
+STREAM_FLUSH_CHARS = 64
+STREAM_FLUSH_INTERVAL = 0.05
+
+
+async def _invoke(callback: Callable, *args):
+    """调用同步或异步回调"""
+    if asyncio.iscoroutinefunction(callback):
+        await callback(*args)
+    else:
+        callback(*args)
+
 
 class StreamingLLM:
     """流式 LLM 调用工具"""
     
-    def __init__(self):
-        self.client = AsyncOpenAI(
-            api_key=settings.openai_api_key,
-            base_url=settings.openai_base_url,
-        )
+    def __init__(
+        self,
+        flush_chars: int = STREAM_FLUSH_CHARS,
+        flush_interval: float = STREAM_FLUSH_INTERVAL,
+    ):
+        self._client: Optional[AsyncOpenAI] = None
         self.model = settings.openai_model
+        self.flush_chars = flush_chars
+        self.flush_interval = flush_interval
+    
+    @property
+    def client(self) -> AsyncOpenAI:
+        """OpenAI 客户端（首次使用或关闭后重新创建）"""
+        if self._client is None or self._client.is_closed():
+            self._client = AsyncOpenAI(
+                api_key=settings.openai_api_key,
+                base_url=settings.openai_base_url,
+            )
+        return self._client
+    
+    async def close(self):
+        """关闭客户端连接池（连接绑定在当前事件循环上，循环结束前调用）"""
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+    
+    async def _stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        temperature: float,
+        emit: Optional[Callable[[str, int], Awaitable[None]]],
+    ) -> Tuple[str, int]:
+        """
+        执行流式调用，按批量策略把增量内容交给 emit(content, token_count)
+        
+        Returns:
+            (完整的响应内容, token 数)
+        """
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+        
+        parts: List[str] = []
+        token_count = 0
+        flushed = 0        # 已回调的片段数
+        pending_chars = 0  # 尚未回调的字符数
+        loop = asyncio.get_running_loop()
+        last_flush = loop.time()
+        
+        stream = await self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=temperature,
+            stream=True,
+        )
+        
+        async for chunk in stream:
+            if chunk.choices and len(chunk.choices) > 0:
+                delta = chunk.choices[0].delta
+                if delta and delta.content:
+                    content = delta.content
+                    parts.append(content)
+                    token_count += 1
+                    pending_chars += len(content)
+                    
+                    # 批量回调，减少逐 token 的回调与下游消息
+                    if emit and (
+                        pending_chars >= self.flush_chars
+                        or loop.time() - last_flush >= self.flush_interval
+                    ):
+                        await emit("".join(parts[flushed:]), token_count)
+                        flushed = len(parts)
+                        pending_chars = 0
+                        last_flush = loop.time()
+        
+        # 回调剩余内容
+        if emit and flushed < len(parts):
+            await emit("".join(parts[flushed:]), token_count)
+        
+        return "".join(parts), token_count
     
     async def stream_completion(
         self,
@@ -30,41 +119,19 @@ class StreamingLLM:
         Args:
             prompt: 用户提示
             system_prompt: 系统提示
-            stream_callback: 流式回调函数，每次收到token时调用
+            stream_callback: 流式回调函数，收到内容时按批调用（每批可能包含多个 token）
             temperature: 温度参数
         
         Returns:
             完整的响应内容
         """
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        messages.append({"role": "user", "content": prompt})
-        
-        full_content = ""
+        emit = None
+        if stream_callback:
+            async def emit(content: str, token_count: int):
+                await _invoke(stream_callback, content)
         
         try:
-            stream = await self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                temperature=temperature,
-                stream=True,
-            )
-            
-            async for chunk in stream:
-                if chunk.choices and len(chunk.choices) > 0:
-                    delta = chunk.choices[0].delta
-                    if delta and delta.content:
-                        content = delta.content
-                        full_content += content
-                        
-                        # 调用流式回调
-                        if stream_callback:
-                            if asyncio.iscoroutinefunction(stream_callback):
-                                await stream_callback(content)
-                            else:
-                                stream_callback(content)
-            
+            full_content, _ = await self._stream(prompt, system_prompt, temperature, emit)
             return full_content
             
         except Exception as e:
@@ -84,57 +151,30 @@ class StreamingLLM:
         Args:
             prompt: 用户提示
             system_prompt: 系统提示
-            stream_callback: 流式回调函数，接收 (content, metadata)
+            stream_callback: 流式回调函数，接收 (content, metadata)，按批调用
             temperature: 温度参数
         
         Returns:
             完整的响应内容
         """
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        messages.append({"role": "user", "content": prompt})
-        
-        full_content = ""
-        token_count = 0
+        emit = None
+        if stream_callback:
+            async def emit(content: str, token_count: int):
+                # 调用流式回调，带元数据
+                await _invoke(stream_callback, content, {
+                    "token_count": token_count,
+                    "finished": False,
+                })
         
         try:
-            stream = await self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                temperature=temperature,
-                stream=True,
-            )
-            
-            async for chunk in stream:
-                if chunk.choices and len(chunk.choices) > 0:
-                    delta = chunk.choices[0].delta
-                    if delta and delta.content:
-                        content = delta.content
-                        full_content += content
-                        token_count += 1
-                        
-                        # 调用流式回调，带元数据
-                        if stream_callback:
-                            metadata = {
-                                "token_count": token_count,
-                                "finished": False,
-                            }
-                            if asyncio.iscoroutinefunction(stream_callback):
-                                await stream_callback(content, metadata)
-                            else:
-                                stream_callback(content, metadata)
+            full_content, token_count = await self._stream(prompt, system_prompt, temperature, emit)
             
             # 发送完成信号
             if stream_callback:
-                metadata = {
+                await _invoke(stream_callback, "", {
                     "token_count": token_count,
                     "finished": True,
-                }
-                if asyncio.iscoroutinefunction(stream_callback):
-                    await stream_callback("", metadata)
-                else:
-                    stream_callback("", metadata)
+                })
             
             return full_content
             
@@ -145,4 +185,3 @@ class StreamingLLM:
 
 # 全局实例
 streaming_llm = StreamingLLM()
-
@@ -0,0 +1,72 @@
+"""研究任务状态缓存 - 减少轮询接口的数据库查询"""
+import time
+import zlib
+from typing import Any, Dict, Optional, Tuple
+
+# 兜底过期时间（秒），需明显长于前端 1-2 秒的轮询间隔
+TASK_STATUS_TTL = 10.0
+# 条目数超过该值时清理过期条目
+TASK_STATUS_MAX_ENTRIES = 1024
+
+
+class TaskStatusCache:
+    """
+    任务状态读穿缓存
+
+    研究任务（研究接口与聊天两条路径）每次更新状态时主动写入（push），
+    状态接口优先读取缓存，未命中时回源数据库并回填。
+    ttl 仅作兜底：推送方异常退出时，过期条目回源数据库。
+    任务完成或失败后淘汰，并在 ttl 内阻止回填旧状态。
+    """
+
+    def __init__(self, ttl: float = TASK_STATUS_TTL):
+        self.ttl = ttl
+        # {task_id: (status, monotonic_ts)}，status 为 None 表示已淘汰
+        self._entries: Dict[str, Tuple[Any, float]] = {}
+
+    def _fresh(self, entry: Optional[Tuple[Any, float]], now: float) -> bool:
+        return entry is not None and now - entry[1] <= self.ttl
+
+    def get(self, task_id: str) -> Optional[Any]:
+        """获取未过期的状态，过期、已淘汰或不存在返回 None"""
+        entry = self._entries.get(task_id)
+        if not self._fresh(entry, time.monotonic()):
+            return None
+        return entry[0]
+
+    def set(self, task_id: str, status: Any):
+        """写入研究任务推送的最新状态"""
+        self._store(task_id, status)
+
+    def fill(self, task_id: str, status: Any):
+        """
+        写入回源数据库读到的状态
+
+        不覆盖未过期的推送状态（可能比数据库更新），也不回填刚淘汰的任务
+        （回源读取可能早于任务结束的提交）
+        """
+        if not self._fresh(self._entries.get(task_id), time.monotonic()):
+            self._store(task_id, status)
+
+    def evict(self, task_id: str):
+        """淘汰任务状态（任务结束时调用）"""
+        self._store(task_id, None)
+
+    def _store(self, task_id: str, status: Any):
+        now = time.monotonic()
+        self._entries[task_id] = (status, now)
+        if len(self._entries) > TASK_STATUS_MAX_ENTRIES:
+            # 清理过期条目（包括已淘汰任务的标记）
+            self._entries = {k: v for k, v in self._entries.items() if self._fresh(v, now)}
+
+
+def make_status_etag(status: Dict[str, Any]) -> str:
+    """根据任务状态生成弱 ETag"""
+    digest = zlib.crc32(
+        f"{status['status']}|{status['current_agent']}|{status['current_task']}".encode("utf-8")
+    )
+    return f'W/"{status["progress"]}-{digest:08x}"'
+
+
+# 全局任务状态缓存实例
+task_status_cache = TaskStatusCache()
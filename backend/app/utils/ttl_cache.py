@@ -0,0 +1,46 @@
+"""进程内 TTL + LRU 缓存"""
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """
+    带过期时间的 LRU 缓存
+
+    超过 maxsize 时淘汰最久未使用的条目，超过 ttl 秒的条目视为不存在。
+    仅在单个事件循环内使用，不做线程同步。
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # {key: (value, expire_at)}
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """获取未过期的值，不存在或过期返回 None"""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expire_at = entry
+        if time.monotonic() >= expire_at:
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """写入值（ttl 为空时使用缓存默认过期时间）"""
+        self._data[key] = (value, time.monotonic() + (self.ttl if ttl is None else ttl))
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable):
+        """删除条目"""
+        self._data.pop(key, None)
+
+    def clear(self):
+        """清空缓存"""
+        self._data.clear()
@@ -1,73 +1,93 @@
 """WebSocket 连接管理器"""
-from typing import List, Dict, Any
+import asyncio
+from typing import Set, Dict, Any, Tuple
+import orjson
 from fastapi import WebSocket
 
 
+def _dumps(data: Dict[str, Any]) -> str:
+    """序列化广播数据（紧凑格式、不转义非 ASCII 字符，与 WebSocket.send_json 一致）"""
+    return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+
+async def _send_all(connections: Tuple[WebSocket, ...], payload: str) -> Tuple[WebSocket, ...]:
+    """并发发送到所有连接，返回发送失败的连接（全部成功时为空元组，不产生分配）"""
+    if len(connections) == 1:
+        # 单个订阅者（最常见）直接发送，省去创建任务的开销
+        try:
+            await connections[0].send_text(payload)
+            return ()
+        except Exception:
+            return connections
+    
+    results = await asyncio.gather(
+        *(connection.send_text(payload) for connection in connections),
+        return_exceptions=True
+    )
+    return tuple(conn for conn, result in zip(connections, results) if isinstance(result, Exception))
+
+
 class ConnectionManager:
     """WebSocket 连接管理器"""
     
     def __init__(self):
-        # 存储活跃的 WebSocket 连接
-        # task_connections: {task_id: [websocket, ...]}
-        self.task_connections: dict[str, List[WebSocket]] = {}
-        # conversation_connections: {conversation_id: [websocket, ...]}
-        self.conversation_connections: dict[str, List[WebSocket]] = {}
+        # 存储活跃的 WebSocket 连接（集合，增删均为 O(1)）
+        # task_connections: {task_id: {websocket, ...}}
+        self.task_connections: Dict[str, Set[WebSocket]] = {}
+        # conversation_connections: {conversation_id: {websocket, ...}}
+        self.conversation_connections: Dict[str, Set[WebSocket]] = {}
     
     async def connect(self, task_id: str, websocket: WebSocket):
         """添加任务连接（兼容旧 API）"""
         await websocket.accept()
-        if task_id not in self.task_connections:
-            self.task_connections[task_id] = []
-        self.task_connections[task_id].append(websocket)
+        self.task_connections.setdefault(task_id, set()).add(websocket)
     
     async def connect_conversation(self, conversation_id: str, websocket: WebSocket):
         """添加会话连接"""
         await websocket.accept()
-        if conversation_id not in self.conversation_connections:
-            self.conversation_connections[conversation_id] = []
-        self.conversation_connections[conversation_id].append(websocket)
+        self.conversation_connections.setdefault(conversation_id, set()).add(websocket)
     
     def disconnect(self, task_id: str, websocket: WebSocket):
         """移除任务连接"""
-        if task_id in self.task_connections:
-            if websocket in self.task_connections[task_id]:
-                self.task_connections[task_id].remove(websocket)
-            if not self.task_connections[task_id]:
+        connections = self.task_connections.get(task_id)
+        if connections is not None:
+            connections.discard(websocket)
+            if not connections:
                 del self.task_connections[task_id]
     
     def disconnect_conversation(self, conversation_id: str, websocket: WebSocket):
         """移除会话连接"""
-        if conversation_id in self.conversation_connections:
-            if websocket in self.conversation_connections[conversation_id]:
-                self.conversation_connections[conversation_id].remove(websocket)
-            if not self.conversation_connections[conversation_id]:
+        connections = self.conversation_connections.get(conversation_id)
+        if connections is not None:
+            connections.discard(websocket)
+            if not connections:
                 del self.conversation_connections[conversation_id]
     
     async def broadcast_progress(self, task_id: str, progress_data: dict):
         """广播进度更新到任务连接（兼容旧 API）"""
         if task_id in self.task_connections:
-            disconnected = []
-            for connection in self.task_connections[task_id]:
-                try:
-                    await connection.send_json(progress_data)
-                except Exception:
-                    disconnected.append(connection)
+            # 只序列化一次，所有连接复用同一份文本
+            payload = _dumps(progress_data)
+            # 对快照并发发送：发送期间其他协程可能增删连接
+            disconnected = await _send_all(tuple(self.task_connections[task_id]), payload)
             
-            for conn in disconnected:
-                self.disconnect(task_id, conn)
+            # 仅在有连接失败时清理
+            if disconnected:
+                for conn in disconnected:
+                    self.disconnect(task_id, conn)
     
     async def broadcast_to_conversation(self, conversation_id: str, data: Dict[str, Any]):
         """广播消息到会话连接"""
         if conversation_id in self.conversation_connections:
-            disconnected = []
-            for connection in self.conversation_connections[conversation_id]:
-                try:
-                    await connection.send_json(data)
-                except Exception:
-                    disconnected.append(connection)
+            # 只序列化一次，所有连接复用同一份文本
+            payload = _dumps(data)
+            # 对快照并发发送：发送期间其他协程可能增删连接
+            disconnected = await _send_all(tuple(self.conversation_connections[conversation_id]), payload)
             
-            for conn in disconnected:
-                self.disconnect_conversation(conversation_id, conn)
+            # 仅在有连接失败时清理
+            if disconnected:
+                for conn in disconnected:
+                    self.disconnect_conversation(conversation_id, conn)
     
     async def broadcast_stream_chunk(
         self,
@@ -1,15 +1,115 @@
 """研究工作流 - 协调各个 Agent 完成研究任务"""
 import asyncio
-from typing import Dict, Any, Optional, Callable, List
+import copy
+from collections import deque
+from typing import Dict, Any, Optional, Callable, Awaitable, List, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache
 
+from ..config import get_settings
 from ..agents.search_agent import SearchAgent
 from ..agents.data_agent import DataAgent
 from ..agents.finance_agent import FinanceAgent
 from ..agents.market_agent import MarketAgent
 from ..agents.insight_agent import InsightAgent
 from ..agents.writer_agent import WriterAgent
+from ..tools.serper_search import close_client as close_search_client
+from ..utils.streaming_llm import streaming_llm
+from ..utils.log import get_logger
+from ..utils.ttl_cache import TTLCache
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+# 所有工作流共享的 Agent 并发上限，避免多个研究任务同时压满 LLM API 触发限流
+# (事件循环, 信号量)：信号量绑定事件循环，换循环（如多次 run_batch）时重新创建
+_agent_semaphore: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = None
+
+# 搜索与数据整理阶段结果缓存 {(阶段, 公司, 深度): 结果}，所有工作流共享
+STAGE_CACHE_TTL = 3600
+_stage_cache = TTLCache(maxsize=256, ttl=STAGE_CACHE_TTL)
+
+
+def _get_stage(stage: str, company: str, depth: str) -> Optional[Dict[str, Any]]:
+    """读取阶段缓存，返回副本，避免不同工作流共享同一个可变结果"""
+    value = _stage_cache.get((stage, company, depth))
+    return copy.deepcopy(value) if value is not None else None
+
+
+def _set_stage(stage: str, company: str, depth: str, value: Dict[str, Any]):
+    """写入阶段缓存（存副本，后续对本次结果的修改不影响缓存）"""
+    _stage_cache.set((stage, company, depth), copy.deepcopy(value))
+
+
+def _has_search_data(search_result: Dict[str, Any]) -> bool:
+    """
+    搜索结果中至少有一个类别拿到了数据
+    
+    SearchAgent 对每个类别都会返回 {"type": ..., "results": [...]}，查询全部失败时
+    results 为空（新闻类别另带 error），因此按 results 判断而不是按类别本身。
+    """
+    for key, value in search_result.get("search_results", {}).items():
+        if key == "company" or not isinstance(value, dict):
+            continue
+        if value.get("results") and not value.get("error"):
+            return True
+    return False
+
+# 摘要与结果推送读取的字段路径
+_NEWS_PATH = ("search_results", "news", "results", "news")
+_COMPANY_NAME_PATH = ("structured_data", "company_name")
+_INDUSTRY_PATH = ("structured_data", "industry")
+_FINANCE_SCORE_PATH = ("financial_analysis", "overall_score")
+_FINANCE_STRENGTHS_PATH = ("financial_analysis", "strengths")
+_MARKET_SCORE_PATH = ("market_analysis", "market_position", "score")
+_MARKET_OUTLOOK_PATH = ("market_analysis", "outlook", "rating")
+_RATING_PATH = ("insights", "recommendation", "rating")
+_CONFIDENCE_PATH = ("insights", "recommendation", "confidence")
+
+
+def _dig(data: Any, path: Tuple[str, ...], default: Any = None) -> Any:
+    """按路径逐层取值，任一层缺失或不是字典时返回 default（不为缺失层分配空字典）"""
+    for key in path:
+        try:
+            data = data[key]
+        except (KeyError, TypeError, IndexError):
+            return default
+    return data
+
+
+@lru_cache(maxsize=None)
+def _shared_agent(agent_cls: type) -> Any:
+    """获取进程内共享的 Agent 实例（Agent 不保存请求级状态，可被多个工作流复用）"""
+    return agent_cls()
+
+
+def _get_agent_semaphore() -> asyncio.Semaphore:
+    """获取当前事件循环的 Agent 并发信号量"""
+    global _agent_semaphore
+    loop = asyncio.get_running_loop()
+    if _agent_semaphore is None or _agent_semaphore[0] is not loop:
+        _agent_semaphore = (loop, asyncio.Semaphore(settings.agent_concurrency or 8))
+    return _agent_semaphore[1]
+
+
+def _start_task(coro: Awaitable[Any]) -> asyncio.Task:
+    """
+    创建工作流内部任务
+    
+    Python 3.12+ 以 eager 方式启动：协程立即执行到首次挂起，可同步完成的节点
+    （缓存命中等）不再额外经过一轮事件循环调度。只作用于工作流自身的任务，
+    不改变事件循环上其他任务的调度方式。
+    """
+    if hasattr(asyncio, "eager_task_factory"):
+        return asyncio.eager_task_factory(asyncio.get_running_loop(), coro)
+    return asyncio.create_task(coro)
+
+
+async def _gated(coro: Awaitable[Any]) -> Any:
+    """在 Agent 并发上限内执行 LLM Agent 调用"""
+    async with _get_agent_semaphore():
+        return await coro
 
 
 class WorkflowStep(Enum):
@@ -25,7 +125,7 @@ class WorkflowStep(Enum):
     FAILED = "failed"
 
 
-@dataclass
+@dataclass(slots=True)
 class WorkflowState:
     """工作流状态"""
     company: str
@@ -46,6 +146,102 @@ class WorkflowState:
     error: Optional[str] = None
 
 
+# 工作流图示
+_WORKFLOW_DIAGRAM = """
+┌─────────────────────────────────────────────────────────────┐
+│                    Research Workflow                         │
+└─────────────────────────────────────────────────────────────┘
+
+  ┌─────────────┐
+  │ SearchAgent │  (1) 搜索收集公司信息
+  └──────┬──────┘
+         │
+         ▼
+  ┌─────────────┐
+  │  DataAgent  │  (2) 数据整理和结构化
+  └──────┬──────┘
+         │
+    ┌────┴────┐
+    ▼         ▼
+┌───────┐ ┌───────┐
+│Finance│ │Market │  (3)(4) 并行分析
+│ Agent │ │ Agent │
+└───┬───┘ └───┬───┘
+    │         │
+    └────┬────┘
+         ▼
+  ┌─────────────┐
+  │InsightAgent │  (5) 提炼投资洞察
+  └──────┬──────┘
+         │
+         ▼
+  ┌─────────────┐
+  │ WriterAgent │  (6) 撰写研究报告
+  └──────┬──────┘
+         │
+         ▼
+    ┌─────────┐
+    │  Report │
+    └─────────┘
+"""
+
+
+@dataclass
+class Node:
+    """工作流节点：依赖的节点全部完成后执行 run()"""
+    name: str
+    deps: Tuple[str, ...]
+    run: Callable[[], Awaitable[Any]]
+
+
+async def run_dag(nodes: List[Node]) -> Dict[str, Any]:
+    """
+    按依赖关系调度节点
+    
+    前驱全部完成的节点立即作为任务启动，互不依赖的节点并发执行。
+    任一节点失败时取消其余正在执行的节点并抛出该异常。
+    
+    Returns:
+        {节点名: run() 的返回值}
+    """
+    by_name = {node.name: node for node in nodes}
+    in_degree = {node.name: len(node.deps) for node in nodes}
+    dependents: Dict[str, List[str]] = {node.name: [] for node in nodes}
+    for node in nodes:
+        for dep in node.deps:
+            dependents[dep].append(node.name)
+    
+    ready = deque(node.name for node in nodes if not node.deps)
+    running: Dict[asyncio.Task, str] = {}
+    results: Dict[str, Any] = {}
+    
+    try:
+        while ready or running:
+            while ready:
+                name = ready.popleft()
+                running[_start_task(by_name[name].run())] = name
+            
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                name = running.pop(task)
+                # 节点失败时在此抛出
+                results[name] = task.result()
+                for child in dependents[name]:
+                    in_degree[child] -= 1
+                    if in_degree[child] == 0:
+                        ready.append(child)
+    finally:
+        # 失败或被取消时，取消其余节点并等待其结束，避免任务泄漏
+        for task in running:
+            task.cancel()
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+    
+    if len(results) != len(nodes):
+        raise ValueError("工作流存在循环依赖或未知的依赖节点")
+    return results
+
+
 class ResearchWorkflow:
     """
     研究工作流
@@ -60,13 +256,13 @@ class ResearchWorkflow:
     """
     
     def __init__(self):
-        # 初始化所有 Agent
-        self.search_agent = SearchAgent()
-        self.data_agent = DataAgent()
-        self.finance_agent = FinanceAgent()
-        self.market_agent = MarketAgent()
-        self.insight_agent = InsightAgent()
-        self.writer_agent = WriterAgent()
+        # 各 Agent 为进程内共享实例
+        self.search_agent = _shared_agent(SearchAgent)
+        self.data_agent = _shared_agent(DataAgent)
+        self.finance_agent = _shared_agent(FinanceAgent)
+        self.market_agent = _shared_agent(MarketAgent)
+        self.insight_agent = _shared_agent(InsightAgent)
+        self.writer_agent = _shared_agent(WriterAgent)
     
     async def run(
         self,
@@ -82,7 +278,7 @@ class ResearchWorkflow:
         
         Args:
             company: 公司名称或代码
-            depth: 研究深度 (basic, standard, deep)
+            depth: 研究深度 (basic, standard, deep)，basic 跳过洞察提炼
             focus_areas: 关注领域
             progress_callback: 进度回调 (progress, agent, task, estimated_time)
             result_callback: 结果回调 (agent, result_summary, result_data)
@@ -100,130 +296,181 @@ class ResearchWorkflow:
             focus_areas=focus_areas
         )
         
-        print(f"\n{'='*60}")
-        print(f"[Workflow] 开始研究: {company}")
-        print(f"[Workflow] 研究深度: {depth}")
-        print(f"[Workflow] 关注领域: {focus_areas}")
-        print(f"{'='*60}\n")
+        logger.info("开始研究: %s（深度: %s，关注领域: %s）", company, depth, focus_areas)
         
-        try:
-            # ============ Step 1: 搜索收集 (0-15%) ============
+        # 结果推送是旁路 I/O，与同一节点的后续处理并行执行
+        result_tasks: List[asyncio.Task] = []
+        
+        def publish_result(agent: str, summary: str, data: Dict[str, Any]):
+            result_tasks.append(_start_task(result_callback(agent, summary, data)))
+        
+        def after_published(step: Callable[[], Awaitable[Any]]) -> Callable[[], Awaitable[Any]]:
+            """
+            节点开始前等待已发出的结果推送完成
+            
+            节点在前驱全部完成后才启动，此时已发出的推送包含全部前驱的结果，
+            保证前驱的结果卡片先于本节点的进度推送到达客户端（推送只是一次写库和广播，
+            等待时间远小于 Agent 调用）。
+            """
+            async def run_step():
+                if result_tasks:
+                    await asyncio.gather(*result_tasks)
+                return await step()
+            return run_step
+        
+        # ============ 各节点（前驱完成后立即调度） ============
+        
+        async def search_step():
+            # Step 1: 搜索收集 (0-15%)
             state.current_step = WorkflowStep.SEARCH
             if progress_callback:
                 await progress_callback(5, "SearchAgent", "🔍 正在搜索公司信息...", 120)
             
-            state.search_result = await self.search_agent.run(company, depth=depth)
+            # 同一公司、同一深度的搜索结果在缓存有效期内直接复用
+            state.search_result = _get_stage("search", company, depth)
+            if state.search_result is None:
+                state.search_result = await self.search_agent.run(company, depth=depth)
+                # 全部类别都失败（限流、密钥错误、超时）时不缓存，下次重新搜索
+                if _has_search_data(state.search_result):
+                    _set_stage("search", company, depth, state.search_result)
+                else:
+                    logger.warning("搜索未获取到任何数据，不缓存: %s", company)
             state.progress = 15
             
             # 发送搜索结果
             if result_callback:
                 search_summary = self._summarize_search_result(state.search_result)
-                await result_callback("SearchAgent", search_summary, {
+                publish_result("SearchAgent", search_summary, {
                     "type": "search",
                     "company": company
                 })
-            
-            # ============ Step 2: 数据整理 (15-30%) ============
+        
+        async def data_step():
+            # Step 2: 数据整理 (15-30%)
             state.current_step = WorkflowStep.DATA_PROCESSING
             if progress_callback:
                 await progress_callback(18, "DataAgent", "📊 正在整理数据...", 90)
             
-            state.data_result = await self.data_agent.run(
-                state.search_result,
-                depth=depth,
-                stream_callback=stream_callback
-            )
+            state.data_result = _get_stage("data", company, depth)
+            if state.data_result is None:
+                state.data_result = await _gated(self.data_agent.run(
+                    state.search_result,
+                    depth=depth,
+                    stream_callback=stream_callback
+                ))
+                # 仅缓存基于有效搜索数据、完整解析的结果，降级结果下次重新整理
+                if (
+                    state.data_result.get("status") == "success"
+                    and _has_search_data(state.search_result)
+                ):
+                    _set_stage("data", company, depth, state.data_result)
             state.progress = 30
             
             # 发送数据整理结果
             if result_callback:
                 data_summary = self._summarize_data_result(state.data_result)
-                await result_callback("DataAgent", data_summary, {
+                publish_result("DataAgent", data_summary, {
                     "type": "data",
                     "structured_data": state.data_result.get("structured_data", {})
                 })
-            
-            # ============ Step 3 & 4: 并行分析 (30-60%) ============
+        
+        async def finance_step():
+            # Step 3: 财务分析 (30-60%，与市场分析并行)
             state.current_step = WorkflowStep.FINANCIAL_ANALYSIS
             if progress_callback:
                 await progress_callback(35, "FinanceAgent", "💰 正在进行财务分析...", 70)
             
-            # 并行执行财务分析和市场分析
-            finance_task = asyncio.create_task(
-                self.finance_agent.run(state.data_result, depth=depth, stream_callback=stream_callback)
-            )
-            market_task = asyncio.create_task(
-                self.market_agent.run(state.data_result, depth=depth, stream_callback=stream_callback)
-            )
-            
-            state.finance_result, state.market_result = await asyncio.gather(
-                finance_task,
-                market_task
-            )
-            state.progress = 60
+            state.finance_result = await _gated(self.finance_agent.run(
+                state.data_result, depth=depth, stream_callback=stream_callback
+            ))
             
-            # 发送财务分析结果
+            # 发送财务分析结果（不等待市场分析）
             if result_callback:
-                fin_summary = self._summarize_finance_result(state.finance_result)
-                await result_callback("FinanceAgent", fin_summary, {
+                fin_summary, fin_score = self._summarize_finance_result(state.finance_result)
+                publish_result("FinanceAgent", fin_summary, {
                     "type": "finance",
-                    "score": state.finance_result.get("financial_analysis", {}).get("overall_score", 5)
+                    "score": fin_score
                 })
+        
+        async def market_step():
+            # Step 4: 市场分析 (30-60%，与财务分析并行)
+            state.market_result = await _gated(self.market_agent.run(
+                state.data_result, depth=depth, stream_callback=stream_callback
+            ))
             
-            # 发送市场分析结果
+            # 发送市场分析结果（不等待财务分析）
             if result_callback:
-                mkt_summary = self._summarize_market_result(state.market_result)
-                await result_callback("MarketAgent", mkt_summary, {
+                mkt_summary, mkt_score = self._summarize_market_result(state.market_result)
+                publish_result("MarketAgent", mkt_summary, {
                     "type": "market",
-                    "score": state.market_result.get("market_analysis", {}).get("market_position", {}).get("score", 5)
+                    "score": mkt_score
                 })
-            
-            # ============ Step 5: 洞察提炼 (60-80%) ============
+        
+        async def insight_step():
+            # Step 5: 洞察提炼 (60-80%)
+            state.progress = 60
             state.current_step = WorkflowStep.INSIGHT_EXTRACTION
             if progress_callback:
                 await progress_callback(65, "InsightAgent", "💡 正在提炼投资洞察...", 30)
             
-            state.insight_result = await self.insight_agent.run(
+            state.insight_result = await _gated(self.insight_agent.run(
                 company=company,
                 data=state.data_result,
                 financial_analysis=state.finance_result,
                 market_analysis=state.market_result,
                 depth=depth,
                 stream_callback=stream_callback
-            )
+            ))
             state.progress = 80
             
             # 发送洞察结果
             if result_callback:
-                insight_summary = self._summarize_insight_result(state.insight_result)
-                await result_callback("InsightAgent", insight_summary, {
+                insight_summary, rating = self._summarize_insight_result(state.insight_result)
+                publish_result("InsightAgent", insight_summary, {
                     "type": "insight",
-                    "recommendation": state.insight_result.get("insights", {}).get("recommendation", {}).get("rating", "观望")
+                    "recommendation": rating
                 })
-            
-            # ============ Step 6: 报告撰写 (80-100%) ============
+        
+        async def writer_step():
+            # Step 6: 报告撰写 (80-100%)
             state.current_step = WorkflowStep.REPORT_WRITING
             if progress_callback:
                 await progress_callback(85, "WriterAgent", "📝 正在撰写研究报告...", 15)
             
-            state.report_result = await self.writer_agent.run(
+            state.report_result = await _gated(self.writer_agent.run(
                 company=company,
                 data=state.data_result,
                 financial_analysis=state.finance_result,
                 market_analysis=state.market_result,
-                insights=state.insight_result,
+                insights=state.insight_result or {},
                 depth=depth,
                 stream_callback=stream_callback
-            )
+            ))
             state.progress = 100
             state.current_step = WorkflowStep.COMPLETED
             
             if progress_callback:
                 await progress_callback(95, "WriterAgent", "✅ 报告生成完成", 5)
+        
+        nodes = [
+            Node("search", (), search_step),
+            Node("data", ("search",), after_published(data_step)),
+            Node("finance", ("data",), after_published(finance_step)),
+            Node("market", ("data",), after_published(market_step)),
+        ]
+        if depth == "basic":
+            # 基础研究不做洞察提炼，报告直接基于财务与市场分析撰写
+            nodes.append(Node("writer", ("finance", "market"), after_published(writer_step)))
+        else:
+            nodes.append(Node("insight", ("finance", "market"), after_published(insight_step)))
+            nodes.append(Node("writer", ("insight",), after_published(writer_step)))
+        
+        try:
+            await run_dag(nodes)
+            # 等待结果推送完成，推送失败同样视为工作流失败
+            await asyncio.gather(*result_tasks)
             
-            print(f"\n{'='*60}")
-            print(f"[Workflow] 研究完成: {company}")
-            print(f"{'='*60}\n")
+            logger.info("研究完成: %s", company)
             
             # 返回最终报告
             return state.report_result.get("report", {})
@@ -232,90 +479,79 @@ class ResearchWorkflow:
             state.current_step = WorkflowStep.FAILED
             state.error = str(e)
             
-            print(f"\n[Workflow] 研究失败: {e}")
-            import traceback
-            traceback.print_exc()
+            # 异常堆栈的格式化与输出在后台日志线程完成
+            logger.exception("研究失败: %s", e)
             
             raise
+        
+        finally:
+            # 失败时已完成 Agent 的结果仍推送完毕，不遗留后台任务
+            if result_tasks:
+                await asyncio.gather(*result_tasks, return_exceptions=True)
+    
+    def run_batch(self, companies: List[str], depth: str = "deep") -> Dict[str, Dict[str, Any]]:
+        """
+        批量研究（同步入口，供脚本调用，不能在事件循环内使用）
+        
+        所有公司在同一个事件循环中依次研究，复用 HTTP 连接池、并发限制与缓存，
+        不为每家公司重复创建和销毁事件循环。单家公司失败不影响其余公司。
+        
+        Returns:
+            {公司: 报告}，研究失败的公司不在结果中
+        """
+        return asyncio.run(self._run_batch(companies, depth))
+    
+    async def _run_batch(self, companies: List[str], depth: str) -> Dict[str, Dict[str, Any]]:
+        """在当前事件循环中依次研究各公司"""
+        reports: Dict[str, Dict[str, Any]] = {}
+        try:
+            for company in companies:
+                try:
+                    reports[company] = await self.run(company, depth=depth)
+                except Exception:
+                    # 失败原因已由 run() 记录
+                    continue
+        finally:
+            # 搜索与 LLM 客户端的连接池绑定在本事件循环上，循环结束前关闭（下次使用时重新创建）
+            await close_search_client()
+            await streaming_llm.close()
+        return reports
     
     def _summarize_search_result(self, result: Dict) -> str:
         """生成搜索结果摘要"""
-        search_results = result.get("search_results", {})
-        news_count = 0
-        news_data = search_results.get("news", {}).get("results", {})
-        if isinstance(news_data, dict) and "news" in news_data:
-            news_count = len(news_data.get("news", []))
+        news = _dig(result, _NEWS_PATH, ())
+        news_count = len(news) if isinstance(news, list) else 0
         
         return f"已收集公司信息、财务数据和 {news_count} 条相关新闻"
     
     def _summarize_data_result(self, result: Dict) -> str:
         """生成数据整理摘要"""
-        data = result.get("structured_data", {})
-        company_name = data.get("company_name", "")
-        industry = data.get("industry", "")
+        company_name = _dig(result, _COMPANY_NAME_PATH, "")
+        industry = _dig(result, _INDUSTRY_PATH, "")
         if company_name and industry:
             return f"识别到「{company_name}」，所属行业：{industry}"
         return "已完成数据结构化整理"
     
-    def _summarize_finance_result(self, result: Dict) -> str:
-        """生成财务分析摘要"""
-        analysis = result.get("financial_analysis", {})
-        score = analysis.get("overall_score", 5)
-        strengths = analysis.get("strengths", [])
+    def _summarize_finance_result(self, result: Dict) -> Tuple[str, Any]:
+        """生成财务分析摘要，同时返回综合评分（供结果推送复用）"""
+        score = _dig(result, _FINANCE_SCORE_PATH, 5)
+        strengths = _dig(result, _FINANCE_STRENGTHS_PATH, [])
         strength_text = "、".join(strengths[:2]) if strengths else "待进一步分析"
-        return f"财务健康度评分 {score}/10，主要优势：{strength_text}"
+        return f"财务健康度评分 {score}/10，主要优势：{strength_text}", score
     
-    def _summarize_market_result(self, result: Dict) -> str:
-        """生成市场分析摘要"""
-        analysis = result.get("market_analysis", {})
-        score = analysis.get("market_position", {}).get("score", 5)
-        rating = analysis.get("outlook", {}).get("rating", "中性")
-        return f"市场地位评分 {score}/10，发展前景：{rating}"
+    def _summarize_market_result(self, result: Dict) -> Tuple[str, Any]:
+        """生成市场分析摘要，同时返回市场地位评分（供结果推送复用）"""
+        score = _dig(result, _MARKET_SCORE_PATH, 5)
+        rating = _dig(result, _MARKET_OUTLOOK_PATH, "中性")
+        return f"市场地位评分 {score}/10，发展前景：{rating}", score
     
-    def _summarize_insight_result(self, result: Dict) -> str:
-        """生成洞察摘要"""
-        insights = result.get("insights", {})
-        recommendation = insights.get("recommendation", {}).get("rating", "观望")
-        confidence = insights.get("recommendation", {}).get("confidence", "低")
-        return f"投资评级：{recommendation}（置信度：{confidence}）"
+    def _summarize_insight_result(self, result: Dict) -> Tuple[str, Any]:
+        """生成洞察摘要，同时返回投资评级（供结果推送复用）"""
+        rating = _dig(result, _RATING_PATH, "观望")
+        confidence = _dig(result, _CONFIDENCE_PATH, "低")
+        return f"投资评级：{rating}（置信度：{confidence}）", rating
     
     def get_workflow_diagram(self) -> str:
         """返回工作流图示"""
-        return """
-┌─────────────────────────────────────────────────────────────┐
-│                    Research Workflow                         │
-└─────────────────────────────────────────────────────────────┘
-
-  ┌─────────────┐
-  │ SearchAgent │  (1) 搜索收集公司信息
-  └──────┬──────┘
-         │
-         ▼
-  ┌─────────────┐
-  │  DataAgent  │  (2) 数据整理和结构化
-  └──────┬──────┘
-         │
-    ┌────┴────┐
-    ▼         ▼
-┌───────┐ ┌───────┐
-│Finance│ │Market │  (3)(4) 并行分析
-│ Agent │ │ Agent │
-└───┬───┘ └───┬───┘
-    │         │
-    └────┬────┘
-         ▼
-  ┌─────────────┐
-  │InsightAgent │  (5) 提炼投资洞察
-  └──────┬──────┘
-         │
-         ▼
-  ┌─────────────┐
-  │ WriterAgent │  (6) 撰写研究报告
-  └──────┬──────┘
-         │
-         ▼
-    ┌─────────┐
-    │  Report │
-    └─────────┘
-"""
+        return _WORKFLOW_DIAGRAM
 
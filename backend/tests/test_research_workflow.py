@@ -0,0 +1,96 @@
+"""研究工作流测试"""
+import asyncio
+
+import pytest
+
+from app.agents.search_agent import SearchAgent
+from app.tools import serper_search
+from app.workflows import research_workflow
+from app.workflows.research_workflow import ResearchWorkflow, _has_search_data
+
+
+class FakeAgent:
+    """返回固定结果的 Agent，记录调用次数"""
+    
+    def __init__(self, result):
+        self.result = result
+        self.calls = 0
+    
+    async def run(self, *args, **kwargs):
+        self.calls += 1
+        return self.result
+
+
+@pytest.fixture
+def failing_serper(monkeypatch):
+    """所有 Serper 请求都失败（如 429 限流）"""
+    async def fetch(self, key, url, payload):
+        raise RuntimeError("429")
+    
+    monkeypatch.setattr(serper_search.SerperSearchTool, "_fetch", fetch)
+    monkeypatch.setattr(serper_search, "_result_cache", serper_search.TTLCache(maxsize=16, ttl=60))
+    monkeypatch.setattr(research_workflow, "_stage_cache", research_workflow.TTLCache(maxsize=16, ttl=60))
+
+
+def make_workflow() -> ResearchWorkflow:
+    """搜索使用真实 SearchAgent，其余 Agent 返回固定结果"""
+    workflow = ResearchWorkflow.__new__(ResearchWorkflow)
+    workflow.search_agent = SearchAgent()
+    workflow.data_agent = FakeAgent({"structured_data": {}, "status": "success"})
+    workflow.finance_agent = FakeAgent({})
+    workflow.market_agent = FakeAgent({})
+    workflow.insight_agent = FakeAgent({})
+    workflow.writer_agent = FakeAgent({"report": {}})
+    return workflow
+
+
+@pytest.mark.parametrize("depth", ["basic", "standard", "deep"])
+async def test_all_failed_search_has_no_data(failing_serper, depth):
+    result = await SearchAgent().run("测试公司", depth=depth)
+    assert not _has_search_data(result)
+
+
+def test_search_with_results_has_data():
+    result = {"search_results": {
+        "company": "测试公司",
+        "company_info": {"type": "company_info", "results": []},
+        "news": {"type": "news", "results": {"news": [{"title": "t"}]}},
+    }}
+    assert _has_search_data(result)
+
+
+async def test_all_failed_search_is_not_cached(failing_serper):
+    workflow = make_workflow()
+    
+    await workflow.run("测试公司", depth="standard")
+    assert research_workflow._get_stage("search", "测试公司", "standard") is None
+    assert research_workflow._get_stage("data", "测试公司", "standard") is None
+    
+    # 下一次研究重新整理数据，而不是复用基于空搜索的结果
+    await workflow.run("测试公司", depth="standard")
+    assert workflow.data_agent.calls == 2
+
+
+async def test_results_arrive_before_next_agent_progress(monkeypatch):
+    monkeypatch.setattr(research_workflow, "_stage_cache", research_workflow.TTLCache(maxsize=16, ttl=60))
+    workflow = make_workflow()
+    workflow.search_agent = FakeAgent({"search_results": {}})
+    events = []
+    
+    async def progress_callback(progress, agent, task, estimated=0):
+        events.append(("progress", agent))
+    
+    async def result_callback(agent, summary, data):
+        # 推送比下一个 Agent 启动更慢
+        await asyncio.sleep(0.01)
+        events.append(("result", agent))
+    
+    await workflow.run(
+        "测试公司", depth="standard",
+        progress_callback=progress_callback, result_callback=result_callback
+    )
+    
+    for earlier, later in [("SearchAgent", "DataAgent"), ("DataAgent", "FinanceAgent"),
+                           ("FinanceAgent", "InsightAgent"), ("MarketAgent", "InsightAgent"),
+                           ("InsightAgent", "WriterAgent")]:
+        assert events.index(("result", earlier)) < events.index(("progress", later))
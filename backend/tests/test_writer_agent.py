@@ -0,0 +1,43 @@
+"""报告撰写 Agent 测试"""
+import pytest
+
+from app.agents.writer_agent import NOT_RATED, WriterAgent
+
+FINANCE = {"financial_analysis": {"overall_score": 8}}
+MARKET = {"market_analysis": {"market_position": {"score": 6}}}
+INSIGHTS = {"insights": {
+    "overall_score": 7,
+    "recommendation": {"rating": "买入", "confidence": "中"},
+    "key_risks": ["竞争加剧"],
+}}
+
+
+@pytest.fixture
+def writer(monkeypatch):
+    writer = WriterAgent()
+    
+    async def summary(*args, **kwargs):
+        return "摘要"
+    
+    monkeypatch.setattr(writer, "_generate_executive_summary", summary)
+    return writer
+
+
+async def test_report_without_insights_is_not_rated(writer):
+    result = await writer.run("测试公司", {}, FINANCE, MARKET, insights={}, depth="basic")
+    report = result["report"]
+    
+    assert report["metadata"]["recommendation"] == NOT_RATED
+    assert report["metadata"]["overall_score"] == 7.0
+    section_ids = {section["id"] for section in report["sections"]}
+    assert section_ids.isdisjoint({"investment_insights", "risk_assessment", "recommendation"})
+
+
+async def test_report_with_insights_uses_insight_rating(writer):
+    result = await writer.run("测试公司", {}, FINANCE, MARKET, insights=INSIGHTS)
+    report = result["report"]
+    
+    assert report["metadata"]["recommendation"] == "买入"
+    assert report["metadata"]["overall_score"] == 7
+    section_ids = [section["id"] for section in report["sections"]]
+    assert section_ids[-3:] == ["investment_insights", "risk_assessment", "recommendation"]
@@ -57,10 +57,13 @@ export const chatApi = {
   },
 
   /**
-   * 获取会话列表
+   * 获取会话列表（传入上一页的 next_cursor 获取下一页）
    */
-  async getConversations(limit = 50): Promise<{ conversations: Conversation[] }> {
-    const response = await api.get('/conversations', { params: { limit } })
+  async getConversations(
+    limit = 50,
+    cursor?: string
+  ): Promise<{ conversations: Conversation[]; next_cursor: string | null }> {
+    const response = await api.get('/conversations', { params: { limit, cursor } })
     return response.data
   },
 